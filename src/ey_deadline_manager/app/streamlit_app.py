@@ -33,6 +33,19 @@ from ey_deadline_manager.core.deadline_agent_backend import (
     process_file as backend_process_file,
     process_folder as backend_process_folder
 )
+from ey_deadline_manager.core.memo import default_rule_memo
+from ey_deadline_manager.core.metrics import default_metrics
+from ey_deadline_manager.core.portfolio import upcoming_portfolio_deadlines
+from ey_deadline_manager.core.urgency import (
+    URGENCY_ICONS,
+    classify_urgency,
+    classify_urgency_many,
+)
+from ey_deadline_manager.core.workload import (
+    WEEKDAY_LABELS,
+    workload_counts,
+    workload_heatmap,
+)
 
 # Configure Gemini API
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -252,6 +265,21 @@ reference_date = st.sidebar.date_input(
 # Convert to datetime for backend compatibility
 reference_datetime = datetime.combine(reference_date, datetime.min.time())
 
+# Regional and municipal holiday calendars for working-day deadlines
+HOLIDAY_CALENDARS = {
+    "National (Portugal)": (None, None),
+    "Região Autónoma dos Açores": ("20", None),
+    "Região Autónoma da Madeira": ("30", None),
+    "Lisboa (municipal)": (None, "Lisboa"),
+    "Porto (municipal)": (None, "Porto"),
+}
+holiday_calendar = st.sidebar.selectbox(
+    "Holiday Calendar:",
+    list(HOLIDAY_CALENDARS),
+    help="Regional or municipal holidays to skip when counting working days"
+)
+subdivision, municipality = HOLIDAY_CALENDARS[holiday_calendar]
+
 # Main content tabs
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "📝 Text Analysis", 
@@ -261,33 +289,29 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "📊 Analytics"
 ])
 
-def agent_process(text, reference_date=None):
+def agent_process(text, reference_date=None, multi_match=False):
     """Process text using the selected AI model from session state."""
     ai_model = getattr(st.session_state, 'ai_model', 'gemini-pro')
-    return backend_process_text(text, reference_date, ai_model)
+    return backend_process_text(
+        text, reference_date, ai_model, subdivision, municipality, multi_match
+    )
+
+def display_result(result, show_model_info=True, urgency=None):
+    """Display processing result with enhanced formatting and proper contrast.
 
-def display_result(result, show_model_info=True):
-    """Display processing result with enhanced formatting and proper contrast."""
+    ``urgency`` is an optional precomputed ``(working_days_left, label)`` pair
+    so batch views can classify every deadline in one call.
+    """
     if "deadline" in result:
         deadline = result["deadline"]
-        days_until = (deadline - datetime.now()).days
-        
-        # Determine urgency
-        if days_until <= 7:
-            urgency_color = "🔴"
-            urgency_text = "URGENT"
-        elif days_until <= 30:
-            urgency_color = "🟡"
-            urgency_text = "IMPORTANT"
-        else:
-            urgency_color = "🟢"
-            urgency_text = "NORMAL"
+        days_until, urgency_text = urgency or classify_urgency(deadline)
+        urgency_color = URGENCY_ICONS[urgency_text]
         
         st.markdown(f"""
         <div class="result-box">
             <h3>{urgency_color} Deadline Identified - {urgency_text} Priority</h3>
             <p><strong>📅 Date:</strong> {deadline.strftime('%Y-%m-%d (%A)')}</p>
-            <p><strong>⏰ Days until deadline:</strong> {days_until} days</p>
+            <p><strong>⏰ Working days until deadline:</strong> {days_until} working days</p>
             <p><strong>⚖️ Rule applied:</strong> {result.get('rule', 'Unknown')}</p>
             <p><strong>📋 Legal basis:</strong> {result.get('legal_basis', 'Not specified')}</p>
             <p><strong>🎯 Confidence:</strong> {result.get('confidence', 'Medium')}</p>
@@ -297,8 +321,23 @@ def display_result(result, show_model_info=True):
         """, unsafe_allow_html=True)
         
         # Show additional details if available
+        if result.get("reference_source") == "document":
+            st.caption(
+                f"📨 Counted from the notice date printed in the document: "
+                f"{result['reference_date'].strftime('%Y-%m-%d')}"
+            )
         if "reasoning" in result:
             st.info(f"💭 **AI Reasoning:** {result['reasoning']}")
+
+        # Every deadline of a multi-obligation document
+        if len(result.get("deadlines", [])) > 1:
+            st.markdown("**📑 All deadlines in this document:**")
+            for other in result["deadlines"]:
+                start, end = other["span"]
+                st.write(
+                    f"• {other['deadline'].strftime('%Y-%m-%d')} - {other['rule']} "
+                    f"(characters {start}-{end})"
+                )
         
         return True
     else:
@@ -319,6 +358,10 @@ with tab1:
         placeholder="Enter text containing legal deadlines (e.g., 'Modelo 22 - IRS deve ser entregue até 31 de julho de 2024')",
         help="Paste any legal document text containing deadline information"
     )
+    multi_match = st.checkbox(
+        "Find every deadline in the text",
+        help="Return all obligations and reply windows mentioned, not just the first rule that applies"
+    )
     
     col1, col2 = st.columns([1, 3])
     
@@ -331,7 +374,7 @@ with tab1:
     
     if analyze_button and text_input.strip():
         with st.spinner(f"🤖 Processing with {st.session_state.ai_model}..."):
-            result = agent_process(text_input.strip(), reference_datetime)
+            result = agent_process(text_input.strip(), reference_datetime, multi_match)
             display_result(result)
     
     # Sample texts for testing
@@ -382,7 +425,13 @@ with tab2:
         if process_file_button:
             with st.spinner(f"🤖 Processing file with {st.session_state.ai_model}..."):
                 try:
-                    result = backend_process_file(str(temp_path), reference_datetime, st.session_state.ai_model)
+                    result = backend_process_file(
+                        str(temp_path),
+                        reference_datetime,
+                        st.session_state.ai_model,
+                        subdivision,
+                        municipality,
+                    )
                     
                     st.subheader(f"📄 Results for {uploaded_file.name}")
                     display_result(result)
@@ -431,13 +480,29 @@ with tab3:
         if process_all_button:
             with st.spinner(f"🤖 Processing {len(non_hidden_files)} files with {st.session_state.ai_model}..."):
                 try:
-                    result = backend_process_folder(str(data_folder), reference_datetime, st.session_state.ai_model)
+                    result = backend_process_folder(
+                        str(data_folder),
+                        reference_datetime,
+                        st.session_state.ai_model,
+                        subdivision,
+                        municipality,
+                    )
                     
                     st.subheader("📊 Batch Processing Results")
                     
+                    if isinstance(result, dict) and "results" in result:
+                        result = result["results"]
+
                     if isinstance(result, list):
                         successful = sum(1 for r in result if "deadline" in r)
                         total = len(result)
+
+                        # Classify every deadline in a single vectorized call
+                        days_left, labels = classify_urgency_many(
+                            [r["deadline"] for r in result if "deadline" in r]
+                        )
+                        urgencies = iter(zip(days_left.tolist(), labels.tolist(), strict=True))
+                        st.session_state.batch_results = [r for r in result if "deadline" in r]
                         
                         # Summary metrics
                         col1, col2, col3 = st.columns(3)
@@ -452,7 +517,10 @@ with tab3:
                         st.subheader("📋 Detailed Results")
                         for r in result:
                             with st.expander(f"📄 {r.get('filename', 'Unknown file')}"):
-                                display_result(r)
+                                display_result(
+                                    r,
+                                    urgency=next(urgencies) if "deadline" in r else None,
+                                )
                     else:
                         display_result(result)
                 
@@ -577,6 +645,131 @@ with tab5:
     with col4:
         st.metric("Cost Savings", "€12,500/month", "Per 100 documents")
     
+    # Deadline workload, aggregated with bincounts over date ordinals
+    st.subheader("📅 Deadline Workload")
+
+    portfolio_file = st.file_uploader(
+        "Client portfolio (CSV):",
+        type=["csv"],
+        help="One row per client with yes/no irs, ies, employer, iva_quarterly and saf_t flag columns",
+    )
+    portfolio = None
+    if portfolio_file is not None:
+        try:
+            portfolio = upcoming_portfolio_deadlines(
+                pd.read_csv(portfolio_file), 365, reference_datetime
+            )
+        except ValueError as e:
+            st.error(f"❌ Error reading portfolio: {str(e)}")
+    if portfolio is not None:
+        workload_deadlines = portfolio["deadline"].to_numpy()
+        workload_obligations = portfolio["obligation"]
+    else:
+        batch_results = st.session_state.get("batch_results", [])
+        workload_deadlines = [r["deadline"] for r in batch_results]
+        workload_obligations = [r.get("rule", "Unknown") for r in batch_results]
+
+    if len(workload_deadlines):
+        workload_start = reference_datetime.date()
+        workload_end = workload_start + timedelta(days=364)
+        grid, weeks = workload_heatmap(workload_deadlines, workload_start, workload_end)
+        counts = workload_counts(
+            workload_deadlines, workload_start, workload_end, workload_obligations
+        )
+
+        fig_heatmap = px.imshow(
+            grid,
+            x=weeks.astype(str),
+            y=list(WEEKDAY_LABELS),
+            color_continuous_scale="Reds",
+            aspect="auto",
+            title="Deadlines per Day (next 12 months)",
+        )
+        st.plotly_chart(fig_heatmap, use_container_width=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            fig_weeks = px.bar(
+                x=counts["weeks"].astype(str),
+                y=counts["per_week"],
+                labels={"x": "Week", "y": "Deadlines"},
+                title="Deadlines per Week",
+            )
+            st.plotly_chart(fig_weeks, use_container_width=True)
+        with col2:
+            fig_obligations = px.bar(
+                x=counts["obligation_labels"],
+                y=counts["per_obligation"],
+                labels={"x": "Obligation", "y": "Deadlines"},
+                title="Deadlines per Obligation",
+            )
+            st.plotly_chart(fig_obligations, use_container_width=True)
+    else:
+        st.info("📂 Process a batch of documents or upload a client portfolio to see the deadline workload.")
+
+    # Rule engine instrumentation: which rules fire and what falls through to the AI
+    st.subheader("🔍 Rule Engine Metrics")
+
+    pipeline_metrics = default_metrics.snapshot()
+    outcomes = pipeline_metrics["outcomes"]
+    if outcomes:
+        documents = sum(outcomes.values())
+        ai_stats = pipeline_metrics["ai"]
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Documents Processed", documents)
+        with col2:
+            st.metric("Rule-based", f"{outcomes.get('rule_based', 0) / documents:.0%}")
+        with col3:
+            st.metric("Sent to AI", f"{outcomes.get('ai_inference', 0) / documents:.0%}")
+        with col4:
+            st.metric(
+                "AI Calls",
+                ai_stats.get("calls", 0),
+                f"{ai_stats.get('lookups', 0) - ai_stats.get('calls', 0)} served from cache",
+                delta_color="off",
+            )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            rule_hits = pipeline_metrics["rules"]
+            if rule_hits:
+                fig_rules = px.bar(
+                    x=list(rule_hits),
+                    y=list(rule_hits.values()),
+                    labels={"x": "Rule", "y": "Hits"},
+                    title="Hits per Rule",
+                )
+                st.plotly_chart(fig_rules, use_container_width=True)
+        with col2:
+            fig_outcomes = px.bar(
+                x=list(outcomes),
+                y=list(outcomes.values()),
+                labels={"x": "Processing method", "y": "Documents"},
+                title="Documents per Processing Method",
+            )
+            st.plotly_chart(fig_outcomes, use_container_width=True)
+
+        latency = pd.DataFrame.from_dict(pipeline_metrics["latency"], orient="index")
+        st.dataframe(
+            latency[["count", "mean_ms", "p50_ms", "p95_ms"]].rename_axis("Stage"),
+            use_container_width=True,
+        )
+        memo_stats = default_rule_memo.stats()
+        st.caption(
+            f"Rule memo: {memo_stats['hits']} hits, {memo_stats['misses']} misses "
+            f"({memo_stats['hit_rate']:.0%} hit rate)"
+        )
+        routing = pipeline_metrics["routing"]
+        if routing:
+            st.caption(
+                f"Local classifier: {routing.get('no_deadline', 0)} skipped as deadline-free, "
+                f"{routing.get('obligation', 0)} resolved without AI, "
+                f"{routing.get('ai', 0)} sent to AI"
+            )
+    else:
+        st.info("📂 Process some documents to see which rules fire and what reaches the AI.")
+
     # Feature comparison chart
     st.subheader("🆚 Model Feature Comparison")
     
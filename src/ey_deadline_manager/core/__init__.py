@@ -3,6 +3,20 @@ EY AI Challenge Deadline Manager - Core Module
 Core business logic for deadline processing and analysis.
 """
 
+from .business_days import (
+    BusinessDayCalendar,
+    add_working_days_many,
+    count_working_days,
+    count_working_days_many,
+    portugal_busdaycalendar,
+    roll_forward_many,
+)
+from .classifier import ObligationClassifier, load_classifier, route_document
+from .dates import (
+    find_explicit_deadline,
+    find_notification_date,
+    iter_explicit_dates,
+)
 from .deadline_agent_backend import (
     DeadlineManagerAgent,
     create_agent,
@@ -10,5 +24,45 @@ from .deadline_agent_backend import (
     process_folder,
     process_text,
 )
+from .holiday_registry import (
+    HolidayCalendarRegistry,
+    get_business_calendar,
+    get_holiday_calendar,
+    get_judicial_calendar,
+    is_working_day,
+    resolve_location,
+)
+from .holiday_snapshot import HolidaySnapshot, build_snapshot, load_snapshot
+from .keywords import KeywordAutomaton
+from .memo import RuleMemo, default_rule_memo, default_spec_memo
+from .metrics import PipelineMetrics, default_metrics
+from .normalize import NormalizedText, normalize_text
+from .numbers import NUMBER_PATTERN, parse_number
+from .portfolio import (
+    obligation_periods,
+    portfolio_deadline_matrix,
+    upcoming_portfolio_deadlines,
+)
+from .schedule import iter_obligation_schedule, iter_schedule
+from .suspension import SuspensionCalendar, judicial_vacations
+from .tax_rules import (
+    RuleTable,
+    RuleTableLoader,
+    get_rule_table,
+    load_rule_table,
+    match_all_tax_rules,
+    match_tax_rule,
+    recurring_obligations,
+    resolve_tax_rule,
+    resolve_tax_rule_many,
+)
+from .templates import (
+    extract_template_deadline,
+    fingerprint_template,
+    header_fields,
+)
+from .urgency import classify_urgency, classify_urgency_many
+from .windows import DocumentExcerpt, document_excerpt, trigger_windows
+from .workload import workload_counts, workload_heatmap
 
 __version__ = "1.0.0"
@@ -0,0 +1,274 @@
+"""
+EY AI Challenge - Business Day Calendar
+Precomputed working-day index for Portuguese deadline arithmetic
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+
+import holidays
+import numpy as np
+
+from .holiday_snapshot import SNAPSHOT
+
+# Monday-Friday working week, as expected by numpy.busdaycalendar
+WORKING_WEEKMASK = "1111100"
+
+# datetime64[D] counts days from 1970-01-01
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class BusinessDayCalendar:
+    """Sorted ordinal index of working days (weekdays that are not holidays).
+
+    Without an explicit ``holiday_calendar`` the national Portuguese working
+    days are read from the compiled holiday snapshot when it covers the range,
+    falling back to ``holidays.Portugal()`` otherwise.
+    """
+
+    def __init__(self, start_year, end_year, holiday_calendar=None):
+        if end_year < start_year:
+            raise ValueError(
+                f"Invalid calendar range: {start_year} is after {end_year}"
+            )
+
+        self.start_year = start_year
+        self.end_year = end_year
+        self.first_ordinal = date(start_year, 1, 1).toordinal()
+        self.last_ordinal = date(end_year, 12, 31).toordinal()
+
+        if (
+            holiday_calendar is None
+            and SNAPSHOT is not None
+            and SNAPSHOT.covers(start_year, end_year)
+        ):
+            self.holiday_calendar = None
+            self.working_ordinals = SNAPSHOT.working_ordinals(start_year, end_year)
+        else:
+            if holiday_calendar is None:
+                holiday_calendar = holidays.Portugal(
+                    years=range(start_year, end_year + 1)
+                )
+            self.holiday_calendar = holiday_calendar
+            self.working_ordinals = [
+                ordinal
+                for ordinal in range(self.first_ordinal, self.last_ordinal + 1)
+                if self._is_working_ordinal(ordinal)
+            ]
+        # Array view of the index for bulk searchsorted lookups
+        self.working = np.array(self.working_ordinals, dtype=np.int64)
+
+    def _is_working_ordinal(self, ordinal):
+        day = date.fromordinal(ordinal)
+        return day.weekday() < 5 and day not in self.holiday_calendar
+
+    def covers(self, day):
+        """Check whether a date falls inside the precomputed range"""
+        return self.first_ordinal <= day.toordinal() <= self.last_ordinal
+
+    def is_working_day(self, day):
+        """Check whether a date is a working day"""
+        if not self.covers(day):
+            raise ValueError(f"Date {day} is outside calendar range")
+        ordinal = day.toordinal()
+        index = bisect_right(self.working_ordinals, ordinal)
+        return index > 0 and self.working_ordinals[index - 1] == ordinal
+
+    def add_working_days(self, start_date, num_days):
+        """Add working days to a date with a single bisect into the index.
+
+        Accepts ``date`` or ``datetime`` and preserves the time of day. Raises
+        ``ValueError`` when the start or the result falls outside the range.
+        """
+        if num_days <= 0:
+            return start_date
+
+        if not self.covers(start_date):
+            raise ValueError(f"Date {start_date} is outside calendar range")
+
+        start_ordinal = start_date.toordinal()
+        index = bisect_right(self.working_ordinals, start_ordinal) + num_days - 1
+        if index >= len(self.working_ordinals):
+            raise ValueError(
+                f"Adding {num_days} working days to {start_date} "
+                f"exceeds calendar range ending {self.end_year}"
+            )
+
+        return start_date + timedelta(days=self.working_ordinals[index] - start_ordinal)
+
+    def roll_forward(self, day):
+        """Move a date to the next working day, or keep it if it is one.
+
+        Accepts ``date`` or ``datetime`` and preserves the time of day.
+        """
+        if not self.covers(day):
+            raise ValueError(f"Date {day} is outside calendar range")
+
+        ordinal = day.toordinal()
+        index = bisect_left(self.working_ordinals, ordinal)
+        if index >= len(self.working_ordinals):
+            raise ValueError(
+                f"Rolling {day} forward exceeds calendar range ending {self.end_year}"
+            )
+
+        return day + timedelta(days=self.working_ordinals[index] - ordinal)
+
+    def _check_covered_many(self, ordinals):
+        if ordinals.size and (
+            ordinals.min() < self.first_ordinal or ordinals.max() > self.last_ordinal
+        ):
+            raise ValueError("Dates are outside calendar range")
+
+    def add_working_days_many(self, starts, offsets):
+        """Vectorized ``add_working_days`` returning a ``datetime64[D]`` array"""
+        starts = np.asarray(starts, dtype="datetime64[D]")
+        offsets = np.asarray(offsets, dtype=np.int64)
+        ordinals = starts.astype(np.int64) + EPOCH_ORDINAL
+        self._check_covered_many(ordinals)
+
+        positive = offsets > 0
+        index = np.searchsorted(self.working, ordinals, side="right") + offsets - 1
+        index = np.where(positive, index, 0)
+        if index.size and index.max() >= self.working.size:
+            raise ValueError(f"Offsets exceed calendar range ending {self.end_year}")
+
+        shifted = (self.working[index] - EPOCH_ORDINAL).astype("datetime64[D]")
+        return np.where(positive, shifted, starts)
+
+    def roll_forward_many(self, days):
+        """Vectorized ``roll_forward`` returning a ``datetime64[D]`` array"""
+        days = np.asarray(days, dtype="datetime64[D]")
+        ordinals = days.astype(np.int64) + EPOCH_ORDINAL
+        self._check_covered_many(ordinals)
+
+        index = np.searchsorted(self.working, ordinals, side="left")
+        if index.size and index.max() >= self.working.size:
+            raise ValueError(
+                f"Rolling forward exceeds calendar range ending {self.end_year}"
+            )
+        return (self.working[index] - EPOCH_ORDINAL).astype("datetime64[D]")
+
+    def count_working_days(self, start_date, end_date):
+        """Count working days after ``start_date`` up to and including ``end_date``.
+
+        This is the inverse of ``add_working_days``; the count is negative
+        when ``end_date`` lies before ``start_date``.
+        """
+        for day in (start_date, end_date):
+            if not self.covers(day):
+                raise ValueError(f"Date {day} is outside calendar range")
+
+        return bisect_right(self.working_ordinals, end_date.toordinal()) - bisect_right(
+            self.working_ordinals, start_date.toordinal()
+        )
+
+
+@lru_cache(maxsize=16)
+def portugal_busdaycalendar(start_year, end_year):
+    """Build a numpy busdaycalendar seeded from Portuguese holidays"""
+    if SNAPSHOT is not None and SNAPSHOT.covers(start_year, end_year):
+        # Weekday holidays are the weekdays missing from the snapshot bitsets
+        ordinals = np.arange(
+            date(start_year, 1, 1).toordinal(), date(end_year, 12, 31).toordinal() + 1
+        )
+        weekdays = ordinals[(ordinals - 1) % 7 < 5]
+        working = np.asarray(SNAPSHOT.working_ordinals(start_year, end_year))
+        holiday_days = np.setdiff1d(weekdays, working) - EPOCH_ORDINAL
+        return np.busdaycalendar(
+            weekmask=WORKING_WEEKMASK, holidays=holiday_days.astype("datetime64[D]")
+        )
+
+    pt_holidays = holidays.Portugal(years=range(start_year, end_year + 1))
+    return np.busdaycalendar(
+        weekmask=WORKING_WEEKMASK,
+        holidays=np.array(sorted(pt_holidays), dtype="datetime64[D]"),
+    )
+
+
+def _covering_busdaycalendar(*day_arrays, extra_years=0):
+    """Cached busdaycalendar spanning every year present in the arrays"""
+    years = np.concatenate(
+        [
+            arr.ravel().astype("datetime64[Y]").astype(np.int64) + 1970
+            for arr in day_arrays
+        ]
+    )
+    return portugal_busdaycalendar(int(years.min()), int(years.max()) + extra_years)
+
+
+def add_working_days_many(starts, offsets, busdaycal=None):
+    """Vectorized ``add_working_days`` over arrays of start dates and offsets.
+
+    ``starts`` is anything ``numpy`` can turn into ``datetime64[D]`` (dates,
+    datetimes, ISO strings or datetime64 arrays) and ``offsets`` an integer
+    array broadcastable against it. Returns a ``datetime64[D]`` array with the
+    same results as the scalar path at day resolution: non-positive offsets
+    return the start unchanged, and counting starts on the day after the
+    start date even when the start itself is a weekend or holiday.
+    """
+    starts = np.asarray(starts, dtype="datetime64[D]")
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if starts.size == 0:
+        return np.broadcast_to(starts, np.broadcast(starts, offsets).shape).copy()
+
+    if busdaycal is None:
+        # 240 working days is a conservative lower bound for one year
+        max_offset = max(int(offsets.max()), 0)
+        busdaycal = _covering_busdaycalendar(starts, extra_years=max_offset // 240 + 1)
+
+    positive = offsets > 0
+    # Rolling a non-working start backwards and then offsetting it counts the
+    # first working day after the start as day one, like the scalar walk
+    shifted = np.busday_offset(
+        starts,
+        np.where(positive, offsets, 0),
+        roll="backward",
+        busdaycal=busdaycal,
+    )
+    return np.where(positive, shifted, starts)
+
+
+def roll_forward_many(days, busdaycal=None):
+    """Vectorized roll of each date to the next working day.
+
+    Dates that already fall on a working day are returned unchanged. Accepts
+    anything ``numpy`` can turn into ``datetime64[D]`` and returns a
+    ``datetime64[D]`` array, so a whole generated schedule is corrected in
+    one pass.
+    """
+    days = np.asarray(days, dtype="datetime64[D]")
+    if days.size == 0:
+        return days.copy()
+
+    if busdaycal is None:
+        busdaycal = _covering_busdaycalendar(days, extra_years=1)
+    return np.busday_offset(days, 0, roll="forward", busdaycal=busdaycal)
+
+
+def count_working_days_many(starts, ends, busdaycal=None):
+    """Vectorized working days after each start up to and including each end.
+
+    Inputs follow ``add_working_days_many``; returns an ``int64`` array that is
+    negative where the end lies before the start (overdue deadlines).
+    """
+    starts = np.asarray(starts, dtype="datetime64[D]")
+    ends = np.asarray(ends, dtype="datetime64[D]")
+    if starts.size == 0 or ends.size == 0:
+        return np.zeros(np.broadcast(starts, ends).shape, dtype=np.int64)
+
+    if busdaycal is None:
+        busdaycal = _covering_busdaycalendar(starts, ends, extra_years=1)
+
+    # busday_count covers [begin, end) only when begin <= end, so count the
+    # half-open interval (earlier, later] and restore the sign afterwards
+    one_day = np.timedelta64(1, "D")
+    earlier = np.minimum(starts, ends)
+    later = np.maximum(starts, ends)
+    counts = np.busday_count(earlier + one_day, later + one_day, busdaycal=busdaycal)
+    return np.where(ends < starts, -counts, counts)
+
+
+def count_working_days(start_date, end_date, busdaycal=None):
+    """Count working days after ``start_date`` up to and including ``end_date``"""
+    return int(count_working_days_many(start_date, end_date, busdaycal))
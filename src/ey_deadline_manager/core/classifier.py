@@ -0,0 +1,233 @@
+"""
+EY AI Challenge - Obligation Classifier
+Offline hashed n-gram linear model routing documents before any paid AI call
+
+The model predicts which obligation a document is about (a recurring rule id
+of the tax rule table, ``notice`` for procedural notices with a day-count
+term, or ``none``) and whether it states a deadline at all. It is trained on
+the labeled corpus in ``core/data/classifier_corpus.jsonl`` and shipped as
+``core/data/obligation_classifier.npz``.
+
+Retrain the shipped model after editing the corpus with::
+
+    python -m ey_deadline_manager.core.classifier
+"""
+
+import json
+import re
+import zlib
+from itertools import pairwise
+from pathlib import Path
+
+import numpy as np
+
+from .normalize import normalize_text
+from .tax_rules import get_rule_table
+
+CLASSIFIER_PATH = Path(__file__).parent / "data" / "obligation_classifier.npz"
+CORPUS_PATH = Path(__file__).parent / "data" / "classifier_corpus.jsonl"
+
+# Hashed feature space: word unigrams, word bigrams and character 4-grams
+N_FEATURES = 2**14
+CHAR_NGRAM = 4
+
+# Below this deadline probability a document is not worth an AI call
+NO_DEADLINE_THRESHOLD = 0.2
+# From this probability a recurring obligation is resolved without the AI
+OBLIGATION_THRESHOLD = 0.85
+
+# How ``route_document`` sends a document on
+ROUTES = ("no_deadline", "obligation", "ai")
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+_DIGITS = re.compile(r"\d")
+
+
+def _bucket(feature):
+    # crc32 is stable across processes, unlike ``hash``
+    return zlib.crc32(feature.encode("utf-8")) & (N_FEATURES - 1)
+
+
+def hashed_features(text):
+    """L2-normalized ``N_FEATURES`` vector of the canonical text of ``text``.
+
+    Digits are folded to ``0`` so "15 dias" and "30 dias" share features.
+    """
+    tokens = _TOKEN.findall(_DIGITS.sub("0", normalize_text(text).text))
+    buckets = [_bucket(f"w:{token}") for token in tokens]
+    buckets += [_bucket(f"b:{a} {b}") for a, b in pairwise(tokens)]
+    for token in tokens:
+        padded = f" {token} "
+        buckets += [
+            _bucket(f"c:{padded[i : i + CHAR_NGRAM]}")
+            for i in range(len(padded) - CHAR_NGRAM + 1)
+        ]
+
+    vector = np.log1p(np.bincount(buckets, minlength=N_FEATURES).astype(np.float32))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _softmax(scores):
+    scores = scores - scores.max(axis=-1, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class ObligationClassifier:
+    """Linear obligation and has-deadline classifier over hashed n-grams.
+
+    Obligations are scored by a softmax over ``labels`` and the deadline
+    probability by a logistic unit on the same features, so one prediction
+    is a hash pass over the text and two small matrix products.
+    """
+
+    def __init__(self, labels, weights, bias, deadline_weights, deadline_bias):
+        self.labels = tuple(labels)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.deadline_weights = np.asarray(deadline_weights, dtype=np.float32)
+        self.deadline_bias = float(deadline_bias)
+
+    @classmethod
+    def train(cls, texts, obligations, has_deadline, epochs=400, rate=8.0, l2=1e-4):
+        """Fit both heads by full-batch gradient descent on cross-entropy.
+
+        Samples are weighted inversely to the frequency of their class, so a
+        corpus with few negatives does not bias the deadline head.
+        """
+        labels = sorted(set(obligations))
+        features = np.stack([hashed_features(text) for text in texts])
+        targets = np.eye(len(labels), dtype=np.float32)[
+            [labels.index(label) for label in obligations]
+        ]
+        deadlines = np.asarray(has_deadline, dtype=np.float32)
+        balance = (1 / targets.sum(axis=0))[targets.argmax(axis=1)] / len(labels)
+        deadline_balance = (
+            np.where(deadlines == 1, 1 / deadlines.sum(), 1 / (1 - deadlines).sum()) / 2
+        )
+
+        weights = np.zeros((N_FEATURES, len(labels)), dtype=np.float32)
+        bias = np.zeros(len(labels), dtype=np.float32)
+        deadline_weights = np.zeros(N_FEATURES, dtype=np.float32)
+        deadline_bias = 0.0
+        for _ in range(epochs):
+            error = (_softmax(features @ weights + bias) - targets) * balance[:, None]
+            weights -= rate * (features.T @ error + l2 * weights)
+            bias -= rate * error.sum(axis=0)
+
+            logits = features @ deadline_weights + deadline_bias
+            deadline_error = (1 / (1 + np.exp(-logits)) - deadlines) * deadline_balance
+            deadline_weights -= rate * (
+                features.T @ deadline_error + l2 * deadline_weights
+            )
+            deadline_bias -= rate * float(deadline_error.sum())
+        return cls(labels, weights, bias, deadline_weights, deadline_bias)
+
+    def predict(self, text):
+        """Most likely ``obligation`` with its ``confidence`` and ``has_deadline``.
+
+        ``probabilities`` holds the full obligation distribution.
+        """
+        features = hashed_features(text)
+        probabilities = _softmax(features @ self.weights + self.bias)
+        best = int(probabilities.argmax())
+        logit = float(features @ self.deadline_weights) + self.deadline_bias
+        return {
+            "obligation": self.labels[best],
+            "confidence": float(probabilities[best]),
+            "has_deadline": float(1 / (1 + np.exp(-logit))),
+            "probabilities": dict(
+                zip(self.labels, map(float, probabilities), strict=True)
+            ),
+        }
+
+    def save(self, path):
+        """Write the model as a compressed ``.npz`` archive"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                labels=np.array(self.labels),
+                weights=self.weights,
+                bias=self.bias,
+                deadline_weights=self.deadline_weights,
+                deadline_bias=np.float64(self.deadline_bias),
+                n_features=np.int64(N_FEATURES),
+            )
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Read a model written by ``save`` (``ValueError`` if incompatible)"""
+        with np.load(path) as archive:
+            if int(archive["n_features"]) != N_FEATURES:
+                raise ValueError(
+                    f"Classifier {path} uses {int(archive['n_features'])} features,"
+                    f" expected {N_FEATURES}"
+                )
+            return cls(
+                archive["labels"].tolist(),
+                archive["weights"],
+                archive["bias"],
+                archive["deadline_weights"],
+                archive["deadline_bias"],
+            )
+
+
+def read_corpus(path=CORPUS_PATH):
+    """``(texts, obligations, has_deadline)`` columns of a labeled JSONL corpus"""
+    rows = [
+        json.loads(line)
+        for line in Path(path).read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    return (
+        [row["text"] for row in rows],
+        [row["obligation"] for row in rows],
+        [row["has_deadline"] for row in rows],
+    )
+
+
+def build_classifier(path=CLASSIFIER_PATH, corpus=CORPUS_PATH):
+    """Train on ``corpus`` and write the model to ``path``"""
+    return ObligationClassifier.train(*read_corpus(corpus)).save(path)
+
+
+def load_classifier(path=CLASSIFIER_PATH):
+    """Load the shipped classifier, or return ``None`` when unavailable"""
+    try:
+        return ObligationClassifier.load(path)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+# Loaded once at import; without it every document is routed to the AI
+CLASSIFIER = load_classifier()
+
+
+def route_document(text, classifier=None):
+    """``(route, prediction)`` for a document the rules could not resolve.
+
+    The route is ``no_deadline`` when a deadline is unlikely, ``obligation``
+    when a recurring obligation of the rule table is predicted with at least
+    ``OBLIGATION_THRESHOLD`` confidence, and ``ai`` otherwise (also when no
+    classifier is available, in which case ``prediction`` is ``None``).
+    """
+    classifier = classifier or CLASSIFIER
+    if classifier is None:
+        return "ai", None
+    prediction = classifier.predict(text)
+    if prediction["has_deadline"] < NO_DEADLINE_THRESHOLD:
+        return "no_deadline", prediction
+    if (
+        prediction["confidence"] >= OBLIGATION_THRESHOLD
+        and prediction["obligation"] in get_rule_table().obligations
+    ):
+        return "obligation", prediction
+    return "ai", prediction
+
+
+if __name__ == "__main__":
+    print(f"✅ Obligation classifier written to {build_classifier()}")
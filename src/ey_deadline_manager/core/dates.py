@@ -0,0 +1,153 @@
+"""
+EY AI Challenge - Explicit Date Extraction
+Single-pass scanner for date literals written out in Portuguese documents
+"""
+
+import calendar
+import re
+from datetime import datetime
+
+from .normalize import normalize_text
+
+# Portuguese month names and abbreviations, in canonical (unaccented) form
+MONTHS_PT = {
+    "janeiro": 1,
+    "fevereiro": 2,
+    "marco": 3,
+    "abril": 4,
+    "maio": 5,
+    "junho": 6,
+    "julho": 7,
+    "agosto": 8,
+    "setembro": 9,
+    "outubro": 10,
+    "novembro": 11,
+    "dezembro": 12,
+    "jan": 1,
+    "fev": 2,
+    "mar": 3,
+    "abr": 4,
+    "mai": 5,
+    "jun": 6,
+    "jul": 7,
+    "ago": 8,
+    "set": 9,
+    "out": 10,
+    "nov": 11,
+    "dez": 12,
+}
+
+_MONTH = "|".join(sorted(MONTHS_PT, key=len, reverse=True))
+
+# One alternation for every supported format, matched against the canonical
+# text of ``normalize_text``; the named group that matched tells which format
+DATE_PATTERN = re.compile(
+    r"\b(?:"
+    # "15 de abril de 2025"
+    rf"(?P<name_day>\d{{1,2}})\s+de\s+(?P<name_month>{_MONTH})\.?"
+    r"\s+de\s+(?P<name_year>\d{4})"
+    # "31/12/2025", "31-12-2025", "31.12.2025"
+    r"|(?P<dmy_day>\d{1,2})(?P<sep>[/.-])"
+    r"(?P<dmy_month>\d{1,2})(?P=sep)(?P<dmy_year>\d{4})"
+    # "2025-06-30"
+    r"|(?P<iso_year>\d{4})-(?P<iso_month>\d{1,2})-(?P<iso_day>\d{1,2})"
+    # "dezembro 2025", "dezembro de 2025": last day of the month
+    rf"|(?P<month>{_MONTH})\.?\s+(?:de\s+)?(?P<year>\d{{4}})"
+    r")\b"
+)
+
+# Header labels introducing the issue or notification date of a notice
+# ("DATA DE EMISSÃO: 27-05-2025", "Data: 2025-04-15", "Notificado em ...")
+NOTIFICATION_LABEL = re.compile(
+    r"\b(?:data(?:\s+d[aeo]\s+(?:emissao|notificacao|expedicao|oficio))?\s*:"
+    r"|(?:emitid|notificad|expedid)[oa]\s+em\s*:?)\s*"
+)
+
+
+def _match_date(match):
+    """Date written by one ``DATE_PATTERN`` match (``ValueError`` if invalid)"""
+    groups = match.groupdict()
+    if groups["name_day"]:
+        year = int(groups["name_year"])
+        month = MONTHS_PT[groups["name_month"]]
+        day = int(groups["name_day"])
+    elif groups["dmy_day"]:
+        year, month, day = (
+            int(groups["dmy_year"]),
+            int(groups["dmy_month"]),
+            int(groups["dmy_day"]),
+        )
+    elif groups["iso_day"]:
+        year, month, day = (
+            int(groups["iso_year"]),
+            int(groups["iso_month"]),
+            int(groups["iso_day"]),
+        )
+    else:
+        year = int(groups["year"])
+        month = MONTHS_PT[groups["month"]]
+        day = calendar.monthrange(year, month)[1]
+    return datetime(year, month, day)
+
+
+def date_at(canonical, position, full_date=True):
+    """Date literal starting exactly at ``position`` of canonical text, or ``None``.
+
+    With ``full_date`` month-only literals ("maio 2025") are rejected.
+    """
+    match = DATE_PATTERN.match(canonical, position)
+    if match is None or (full_date and match.group("month")):
+        return None
+    try:
+        return _match_date(match)
+    except ValueError:
+        return None
+
+
+def iter_explicit_dates(text):
+    """Yield ``(date, span)`` for every valid date literal in ``text``, in order.
+
+    Impossible dates such as ``31/02/2025`` are skipped. Spans refer to the
+    original ``text``.
+    """
+    normalized = normalize_text(text)
+    for match in DATE_PATTERN.finditer(normalized.text):
+        try:
+            yield _match_date(match), normalized.original_span(*match.span())
+        except ValueError:
+            continue
+
+
+def find_explicit_deadline(text, reference_date):
+    """First date written in ``text`` that falls after ``reference_date``.
+
+    Earlier dates are taken to be the document or notification date rather
+    than a deadline. Returns a result dict shaped like the rule-based results,
+    with the ``span`` of the date literal, or ``None``.
+    """
+    for date, span in iter_explicit_dates(text):
+        if date > reference_date:
+            return {
+                "deadline": date,
+                "rule": "Date stated in document",
+                "priority": "medium",
+                "legal_basis": "Explicit date in document",
+                "confidence": "high",
+                "span": span,
+            }
+    return None
+
+
+def find_notification_date(text):
+    """Issue or notification date printed in a notice's header, or ``None``.
+
+    Only a full date directly after a header label counts, so deadlines
+    ("data limite de entrega foi 20 de maio de 2025") and month-only
+    mentions are never taken for the notice date.
+    """
+    canonical = normalize_text(text).text
+    for label in NOTIFICATION_LABEL.finditer(canonical):
+        date = date_at(canonical, label.end())
+        if date is not None:
+            return date
+    return None
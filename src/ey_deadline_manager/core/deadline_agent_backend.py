@@ -5,42 +5,121 @@ Core processing engine extracted from AutoCalendarAgent.ipynb
 
 import json
 import os
-import re
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import Literal
 
 import google.generativeai as genai
-import holidays
-from dateutil.relativedelta import relativedelta
+import numpy as np
+import pandas as pd
 from langchain_google_genai import ChatGoogleGenerativeAI
 from PyPDF2 import PdfReader
 
+from .classifier import route_document
+from .dates import find_explicit_deadline, find_notification_date
+from .holiday_registry import get_business_calendar, get_holiday_calendar
+from .memo import default_rule_memo, default_spec_memo
+from .metrics import default_metrics
+from .normalize import normalize_text
+from .suspension import JUDICIAL_SUSPENSION
+from .tax_rules import (
+    RESULT_FIELDS,
+    SPEC_KINDS,
+    _calendar_years,
+    get_rule_table,
+    match_tax_rule,
+    resolve_tax_rule,
+    resolve_tax_rule_many,
+)
+from .templates import extract_template_deadline
+from .urgency import URGENCY_LEVELS, classify_urgency_many
+from .windows import document_excerpt
+from .workload import workload_counts
+
 # Configure Gemini API
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
 
 
+# Result metadata assumed when the AI leaves a field out
+AI_SPEC_DEFAULTS = {
+    "rule": "Gemini AI analysis",
+    "priority": "medium",
+    "legal_basis": "AI inference",
+    "confidence": "medium",
+}
+
+
+def _start_of_day(moment):
+    """``moment`` at midnight: the rules resolve deadlines at day resolution"""
+    return datetime(moment.year, moment.month, moment.day)
+
+
+def _ai_spec(payload):
+    """Validate a parsed AI answer into a rule specification"""
+    if "error" in payload:
+        return {"error": str(payload["error"])}
+    kind = payload.get("kind")
+    if kind is None and "deadline" in payload:
+        # An absolute date answer
+        kind, payload = "fixed", {**payload, "date": payload["deadline"]}
+    if kind not in SPEC_KINDS:
+        return {"error": f"Unknown deadline kind from AI: {kind}"}
+
+    spec = {"kind": kind}
+    try:
+        if kind == "fixed":
+            date = datetime.strptime(payload["date"], "%Y-%m-%d")
+            spec["date"] = date.date().isoformat()
+        if kind == "annual":
+            spec["month"] = int(payload["month"])
+        if kind in ("annual", "monthly"):
+            spec["day"] = int(payload["day"])
+        if kind in ("working_days", "calendar_days"):
+            spec["days"] = int(payload["days"])
+    except (KeyError, TypeError, ValueError) as e:
+        return {"error": f"Incomplete AI deadline specification: {e}"}
+    for field, default in AI_SPEC_DEFAULTS.items():
+        spec[field] = payload.get(field) or default
+    return spec
+
+
 class DeadlineManagerAgent:
     """AI-powered deadline manager for Portuguese tax obligations"""
 
-    def __init__(self, ai_model: Literal["gemini-pro", "gemini-2.0-flash-001"] = "gemini-pro"):
-        self.portuguese_holidays = holidays.Portugal()
+    def __init__(
+        self, ai_model: Literal["gemini-pro", "gemini-2.0-flash-001"] = "gemini-pro"
+    ):
         self.reference_date = datetime.now()
+        # Shared calendars compiled from the holiday snapshot: no per-agent
+        # holiday expansion cost
+        self.calendar_years = (
+            self.reference_date.year - 1,
+            self.reference_date.year + 5,
+        )
+        self.business_calendar = get_business_calendar(*self.calendar_years)
         self.ai_model = ai_model
-        
+
         # Initialize AI models
         if ai_model == "gemini-2.0-flash-001":
             self.llm = ChatGoogleGenerativeAI(
                 model="gemini-2.0-flash-001",
                 google_api_key=GEMINI_API_KEY,
-                temperature=0.1
+                temperature=0.1,
             )
         else:
             # Default to original Gemini Pro
             self.genai_model = genai.GenerativeModel("gemini-pro")
 
+    @property
+    def portuguese_holidays(self):
+        """Shared national holiday calendar, expanded for the agent's years"""
+        return get_holiday_calendar(
+            "PT", range(self.calendar_years[0], self.calendar_years[1] + 1)
+        )
+
     def extract_text_from_image(self, image_path_or_file, use_mock_ocr=True):
         """Extract text from image using OCR (mock implementation for demo)"""
         try:
@@ -162,175 +241,186 @@ class DeadlineManagerAgent:
         else:
             return f"Documento fiscal - {filename}"
 
-    def add_working_days(self, start_date, num_days):
-        """Add working days to a date, skipping weekends and Portuguese holidays"""
-        current_date = start_date
-        days_added = 0
-
-        while days_added < num_days:
-            current_date += timedelta(days=1)
-            if (
-                current_date.weekday() < 5
-                and current_date not in self.portuguese_holidays
-            ):
-                days_added += 1
-
-        return current_date
-
-    def apply_portuguese_tax_rules(self, text, reference_date=None):
-        """Apply specific Portuguese tax deadline rules"""
-        ref = reference_date or self.reference_date
-        text_lower = text.lower()
-
-        # Modelo 22 (IRS) - due by July 31st
-        if "modelo 22" in text_lower or (
-            "irs" in text_lower and ("modelo" in text_lower or "deadline" in text_lower)
-        ):
-            deadline = datetime(ref.year, 7, 31)
-            if deadline < ref:
-                deadline = datetime(ref.year + 1, 7, 31)
-            return {
-                "deadline": deadline,
-                "rule": "Modelo 22 - IRS deadline",
-                "priority": "high",
-                "legal_basis": "CIRS - Código do IRS",
-                "confidence": "high",
-            }
-
-        # IES - due by April 15th
-        if "ies" in text_lower:
-            deadline = datetime(ref.year, 4, 15)
-            if deadline < ref:
-                deadline = datetime(ref.year + 1, 4, 15)
-            return {
-                "deadline": deadline,
-                "rule": "IES deadline",
-                "priority": "high",
-                "legal_basis": "CIRS - Informação Empresarial Simplificada",
-                "confidence": "high",
-            }
-
-        # Modelo 30 (Retenções na fonte) - monthly, 20th of following month
-        if (
-            "modelo 30" in text_lower
-            or "retenções na fonte" in text_lower
-            or "retencao na fonte" in text_lower
-            or "retencao" in text_lower
-        ):
-            next_month = ref.replace(day=1) + relativedelta(months=1)
-            deadline = next_month.replace(day=20)
-            return {
-                "deadline": deadline,
-                "rule": "Modelo 30 - Monthly retention deadline",
-                "priority": "medium",
-                "legal_basis": "CIRS - Retenções na fonte",
-                "confidence": "high",
-            }
-
-        # IVA declarations - quarterly deadlines
-        if "iva" in text_lower and (
-            "declaracao" in text_lower or "declaração" in text_lower
-        ):
-            quarters = [(3, 31), (6, 30), (9, 30), (12, 31)]
-            for month, day in quarters:
-                deadline = datetime(ref.year, month, day)
-                if deadline > ref:
-                    return {
-                        "deadline": deadline,
-                        "rule": "IVA quarterly declaration",
-                        "priority": "high",
-                        "legal_basis": "CIVA - Código do IVA",
-                        "confidence": "high",
-                    }
-            # If all quarters passed, use first quarter of next year
-            deadline = datetime(ref.year + 1, 3, 31)
-            return {
-                "deadline": deadline,
-                "rule": "IVA quarterly declaration",
-                "priority": "high",
-                "legal_basis": "CIVA - Código do IVA",
-                "confidence": "high",
-            }
-
-        # SAF-T - monthly, 25th of following month
-        if "saf-t" in text_lower:
-            next_month = ref.replace(day=1) + relativedelta(months=1)
-            deadline = next_month.replace(day=25)
-            return {
-                "deadline": deadline,
-                "rule": "SAF-T monthly deadline",
-                "priority": "medium",
-                "legal_basis": "Portaria n.º 321-A/2007",
-                "confidence": "high",
-            }
-
-        # DMR (Declaração Mensal de Remunerações) - 10th of following month
+    def get_business_calendar(self, subdivision=None, municipality=None):
+        """Working-day index for a region or municipality, compiled once per process"""
+        if subdivision is None and municipality is None:
+            return self.business_calendar
+        return get_business_calendar(
+            *self.calendar_years, "PT", subdivision, municipality
+        )
+
+    def _calendar_for(
+        self, start_date, num_days=0, subdivision=None, municipality=None
+    ):
+        """Working-day index covering ``num_days`` working days from ``start_date``.
+
+        That is the agent's own calendar when its years cover the count, and
+        otherwise a shared one spanning the years of the count.
+        """
+        first_year, last_year = self.calendar_years
         if (
-            "dmr" in text_lower
-            or "declaração mensal de remunerações" in text_lower
-            or "declaracao mensal" in text_lower
+            first_year <= start_date.year
+            and start_date.year + num_days // 240 < last_year
         ):
-            next_month = ref.replace(day=1) + relativedelta(months=1)
-            deadline = next_month.replace(day=10)
-            return {
-                "deadline": deadline,
-                "rule": "DMR monthly deadline",
-                "priority": "medium",
-                "legal_basis": "Código do Trabalho",
-                "confidence": "high",
-            }
-
-        # Working days patterns - "X dias úteis"
-        working_days_pattern = r"(\d+)\s+dias?\s+úteis"
-        match = re.search(working_days_pattern, text_lower)
-        if match:
-            days = int(match.group(1))
-            deadline = self.add_working_days(ref, days)
-            return {
-                "deadline": deadline,
-                "rule": f"{days} working days from notification",
-                "priority": "urgent",
-                "legal_basis": "CPPT - Código de Procedimento e de Processo Tributário",
-                "confidence": "high",
-            }
-
-        # Regular days pattern - "prazo de X dias"
-        days_pattern = r"prazo\s+(?:de\s+)?(\d+)\s+dias?"
-        match = re.search(days_pattern, text_lower)
-        if match:
-            days = int(match.group(1))
-            deadline = ref + timedelta(days=days)
-            return {
-                "deadline": deadline,
-                "rule": f"{days} days from notification",
-                "priority": "urgent",
-                "legal_basis": "CPPT - Código de Procedimento e de Processo Tributário",
-                "confidence": "high",
-            }
-
-        return None
-
-    def process_with_gemini_ai(self, text, reference_date=None):
-        """Use Gemini AI to extract deadline information when rule-based approach fails"""
+            return self.get_business_calendar(subdivision, municipality)
+        # Outside the agent's range - use a shared calendar that covers it
+        return get_business_calendar(
+            *_calendar_years(start_date.year, start_date.year, num_days),
+            "PT",
+            subdivision,
+            municipality,
+        )
+
+    def add_working_days(
+        self, start_date, num_days, subdivision=None, municipality=None
+    ):
+        """Add working days to a date, skipping weekends and Portuguese holidays"""
+        return self._calendar_for(
+            start_date, num_days, subdivision, municipality
+        ).add_working_days(start_date, num_days)
+
+    def apply_portuguese_tax_rules(
+        self, text, reference_date=None, subdivision=None, municipality=None
+    ):
+        """Apply specific Portuguese tax deadline rules.
+
+        ``subdivision`` and ``municipality`` select the regional or municipal
+        holiday calendar used for working-day deadlines. Fixed-date
+        obligations that fall on a weekend or holiday are rolled forward to
+        the next working day (Código Civil, art. 279.º, al. e)); the
+        unadjusted date is kept as ``original_deadline``.
+
+        Results are memoized per document content, reference day, location,
+        rule table version and holiday calendar generation; the reference
+        date is taken at midnight, so repeated runs on the same day hit.
+        """
+        ref = _start_of_day(reference_date or self.reference_date)
+        table = get_rule_table()
+
+        def evaluate():
+            spec = table.match(text)
+            if spec is None:
+                return None
+            result = resolve_tax_rule(spec, ref, subdivision, municipality)
+            result["rule_id"] = spec["rule_id"]
+            return result
+
+        key = default_rule_memo.key(
+            "first", text, ref.date(), subdivision, municipality, table.version
+        )
+        return default_rule_memo.get(key, evaluate)
+
+    def extract_all_deadlines(
+        self, text, reference_date=None, subdivision=None, municipality=None
+    ):
+        """Every rule-based deadline in a document, in document order.
+
+        The text is scanned once; each result carries the usual deadline
+        fields plus the ``rule_id`` and the character ``span`` of the text
+        that triggered it. Like ``apply_portuguese_tax_rules`` it is
+        memoized and resolves the reference date at midnight.
+        """
+        ref = _start_of_day(reference_date or self.reference_date)
+        table = get_rule_table()
+
+        def evaluate():
+            results = []
+            for spec in table.match_all(text):
+                result = resolve_tax_rule(spec, ref, subdivision, municipality)
+                result["rule_id"] = spec["rule_id"]
+                result["span"] = spec["span"]
+                results.append(result)
+            return results
+
+        key = default_rule_memo.key(
+            "all", text, ref.date(), subdivision, municipality, table.version
+        )
+        return default_rule_memo.get(key, evaluate)
+
+    def sweep_reference_dates(
+        self, text, reference_dates, subdivision=None, municipality=None
+    ):
+        """What-if planning: evaluate the matched rule for many reference dates.
+
+        The text is matched once and the rule is resolved for every reference
+        date in one vectorized pass. Returns a DataFrame indexed by reference
+        date (at day resolution) with the deadline, the unadjusted
+        ``original_deadline`` and the rule metadata; it has no rows when no
+        rule applies.
+        """
+        columns = ["deadline", "original_deadline", *RESULT_FIELDS]
+        refs = np.asarray(reference_dates, dtype="datetime64[D]").ravel()
+        index = pd.DatetimeIndex(refs, name="reference_date")
+
+        spec = match_tax_rule(text)
+        if spec is None:
+            return pd.DataFrame(columns=columns, index=index[:0])
+
+        deadlines = resolve_tax_rule_many(spec, refs, subdivision, municipality)
+        table = pd.DataFrame(
+            {
+                "deadline": pd.DatetimeIndex(deadlines["deadline"]),
+                "original_deadline": pd.DatetimeIndex(deadlines["original_deadline"]),
+            },
+            index=index,
+        )
+        for field in RESULT_FIELDS:
+            table[field] = spec[field]
+        if spec.get("suspended"):
+            table["suspension"] = JUDICIAL_SUSPENSION
+        return table
+
+    def extract_ai_spec(self, text):
+        """Reference-free deadline specification extracted by Gemini AI.
+
+        The model describes how the deadline is computed ("10 working days
+        after notification", "day 25 of the following month") or names a
+        ``fixed`` date, in the specification format of the tax rules. Valid
+        specifications are memoized per document content and model, so
+        re-dating a document never repeats the paid call. Returns the
+        specification, or a dict with an ``error``.
+        """
+        key = ("ai_spec", normalize_text(text).digest, self.ai_model)
+        default_metrics.increment("ai", "lookups")
+        return default_spec_memo.get(
+            key,
+            lambda: self._ask_ai_for_spec(text),
+            cacheable=lambda spec: "error" not in spec,
+        )
+
+    def _ask_ai_for_spec(self, text):
+        default_metrics.increment("ai", "calls")
+        with default_metrics.timer("ai_call"):
+            spec = self._query_ai_for_spec(text)
+        default_metrics.increment("ai", f"kind:{spec.get('kind', 'error')}")
+        return spec
+
+    def _query_ai_for_spec(self, text):
         try:
-            ref = reference_date or self.reference_date
+            # Canonical text: same content with fewer tokens (no whitespace runs)
+            canonical = normalize_text(text).text
 
             prompt = f"""
-            You are a Portuguese tax deadline expert. Analyze this text and extract deadline information.
+            You are a Portuguese tax deadline expert. Analyze this text and
+            describe how its deadline is computed.
 
-            Reference date: {ref.strftime("%Y-%m-%d")}
-            Text: "{text}"
+            Text: "{canonical}"
 
             Based on Portuguese tax law (CPPT, CIRS, CIVA), identify:
             1. The specific tax obligation mentioned
-            2. The deadline calculation rule
-            3. The exact deadline date
-            4. Priority level (urgent/high/medium/low)
-            5. Legal basis for the deadline
+            2. The deadline calculation rule, independent of today's date
+            3. Priority level (urgent/high/medium/low)
+            4. Legal basis for the deadline
 
-            Return ONLY a valid JSON object with:
+            Return ONLY a valid JSON object with the fields below, where kind
+            is one of fixed, annual, monthly, quarterly, working_days or
+            calendar_days:
             {{
-                "deadline": "YYYY-MM-DD",
+                "kind": "kind of deadline rule",
+                "date": "YYYY-MM-DD (fixed only: a date written in the text)",
+                "month": "month number (annual only)",
+                "day": "day of the month (annual and monthly only)",
+                "days": "days from notification (working_days/calendar_days only)",
                 "rule": "description of the rule applied",
                 "priority": "urgency level",
                 "legal_basis": "relevant legal framework",
@@ -356,16 +446,7 @@ class DeadlineManagerAgent:
                 json_str = response_text[start:end]
 
                 try:
-                    result = json.loads(json_str)
-                    if "deadline" in result and "error" not in result:
-                        deadline_dt = datetime.strptime(result["deadline"], "%Y-%m-%d")
-                        return {
-                            "deadline": deadline_dt,
-                            "rule": result.get("rule", "Gemini AI analysis"),
-                            "priority": result.get("priority", "medium"),
-                            "legal_basis": result.get("legal_basis", "AI inference"),
-                            "confidence": result.get("confidence", "medium"),
-                        }
+                    return _ai_spec(json.loads(json_str))
                 except json.JSONDecodeError as e:
                     return {"error": f"JSON parsing error: {e}"}
 
@@ -374,32 +455,157 @@ class DeadlineManagerAgent:
         except Exception as e:
             return {"error": f"Gemini AI error: {e!s}"}
 
-    def process_document(self, text, reference_date=None, use_ai_fallback=True):
-        """Main processing function that combines rule-based and AI approaches"""
-        ref = reference_date or self.reference_date
+    def process_with_gemini_ai(
+        self, text, reference_date=None, subdivision=None, municipality=None
+    ):
+        """Use Gemini AI to extract deadline information when rule-based approach fails.
 
-        # First try rule-based approach
-        rule_result = self.apply_portuguese_tax_rules(text, ref)
+        The AI extraction is reference-free and memoized; only the cheap
+        ``resolve_tax_rule`` step depends on ``reference_date``.
+        """
+        ref = reference_date or self.reference_date
+        spec = self.extract_ai_spec(text)
+        if "error" in spec:
+            return spec
+        try:
+            return resolve_tax_rule(spec, ref, subdivision, municipality)
+        except ValueError as e:
+            return {"error": f"Invalid AI deadline specification: {e}"}
+
+    def process_document(
+        self,
+        text,
+        reference_date=None,
+        use_ai_fallback=True,
+        subdivision=None,
+        municipality=None,
+        multi_match=False,
+        use_document_date=True,
+    ):
+        """Main processing function that combines rule-based and AI approaches.
+
+        Stages run cheapest first: recognised AT notice templates, the tax
+        rules, explicit dates and finally Gemini. Before the Gemini call the
+        local obligation classifier (see ``route_document``) drops documents
+        without a deadline and resolves obvious recurring obligations itself,
+        so only ambiguous documents pay for the model. On very large documents the
+        rules, the date parser and Gemini only read the sentences around
+        deadline words and rule keywords (see ``document_excerpt``); spans in
+        the results still refer to ``text``.
+
+        With ``multi_match`` every rule-based deadline in the document is
+        returned under ``deadlines`` (see ``extract_all_deadlines``) and the
+        top-level fields describe the earliest one.
+
+        With ``use_document_date`` the issue or notification date printed in
+        the document header ("Data de emissão: ...") is the reference date,
+        falling back to ``reference_date`` and then the agent's own date. The
+        date used is returned as ``reference_date``, and ``reference_source``
+        says whether it came from the ``document``.
+        """
+        document_date = find_notification_date(text) if use_document_date else None
+        ref = document_date or reference_date or self.reference_date
+        started = time.perf_counter()
+        reference = (ref, "document" if document_date else "given")
+
+        # Known AT notice templates go straight to their dedicated extractor
+        with default_metrics.timer("template"):
+            template_result = extract_template_deadline(
+                text, ref, subdivision, municipality
+            )
+        if template_result:
+            default_metrics.increment("templates", template_result["template"])
+            return self._finish(template_result, "template", started, reference)
+
+        # Everything after the templates reads the trigger windows only
+        with default_metrics.timer("windows"):
+            excerpt = document_excerpt(text)
+        relevant = excerpt.text
+
+        # Then the rule-based approach
+        with default_metrics.timer("rules"):
+            if multi_match:
+                deadlines = self.extract_all_deadlines(
+                    relevant, ref, subdivision, municipality
+                )
+                for result in deadlines:
+                    result["span"] = excerpt.original_span(*result["span"])
+                rule_result = (
+                    dict(
+                        min(deadlines, key=lambda r: r["deadline"]),
+                        deadlines=deadlines,
+                    )
+                    if deadlines
+                    else None
+                )
+            else:
+                rule_result = self.apply_portuguese_tax_rules(
+                    relevant, ref, subdivision, municipality
+                )
         if rule_result:
-            rule_result["processing_method"] = "rule_based"
-            rule_result["processed_at"] = datetime.now()
-            return rule_result
-
-        # Fallback to AI if enabled
+            for result in rule_result.get("deadlines", [rule_result]):
+                default_metrics.increment("rules", result["rule_id"])
+            return self._finish(rule_result, "rule_based", started, reference)
+
+        # Then a date written out in the document, before paying for an AI call
+        with default_metrics.timer("dates"):
+            date_result = find_explicit_deadline(relevant, ref)
+        if date_result:
+            date_result["span"] = excerpt.original_span(*date_result["span"])
+            return self._finish(date_result, "date_extraction", started, reference)
+
+        # Fallback to AI if enabled, unless the local classifier settles it
         if use_ai_fallback:
-            ai_result = self.process_with_gemini_ai(text, ref)
+            with default_metrics.timer("classifier"):
+                route, prediction = route_document(relevant)
+            default_metrics.increment("routing", route)
+            if route == "no_deadline":
+                return self._finish(
+                    {
+                        "error": "No deadline expected in document",
+                        "classification": prediction,
+                    },
+                    "failed",
+                    started,
+                    reference,
+                )
+            if route == "obligation":
+                obligation = prediction["obligation"]
+                spec = get_rule_table().obligations[obligation]
+                result = resolve_tax_rule(spec, ref, subdivision, municipality)
+                result["rule_id"] = obligation
+                result["classification"] = prediction
+                default_metrics.increment("rules", obligation)
+                return self._finish(result, "classifier", started, reference)
+
+            with default_metrics.timer("ai"):
+                ai_result = self.process_with_gemini_ai(
+                    relevant, ref, subdivision, municipality
+                )
             if "deadline" in ai_result:
-                ai_result["processing_method"] = "ai_inference"
-                ai_result["processed_at"] = datetime.now()
-                return ai_result
-
-        return {
-            "error": "No deadline could be determined",
-            "processing_method": "failed",
-            "processed_at": datetime.now(),
-        }
-
-    def process_file(self, file_path_or_object, reference_date=None):
+                return self._finish(ai_result, "ai_inference", started, reference)
+
+        return self._finish(
+            {"error": "No deadline could be determined"}, "failed", started, reference
+        )
+
+    @staticmethod
+    def _finish(result, processing_method, started, reference):
+        """Stamp a result with its reference date and method, and record metrics"""
+        result["reference_date"], result["reference_source"] = reference
+        result["processing_method"] = processing_method
+        result["processed_at"] = datetime.now()
+        default_metrics.increment("outcomes", processing_method)
+        default_metrics.observe("document", time.perf_counter() - started)
+        return result
+
+    def process_file(
+        self,
+        file_path_or_object,
+        reference_date=None,
+        subdivision=None,
+        municipality=None,
+    ):
         """Process a file (PDF or image) and extract deadline information"""
         try:
             # Determine file type
@@ -429,7 +635,9 @@ class DeadlineManagerAgent:
                 return {"error": f"Could not extract text from file: {text}"}
 
             # Process the extracted text
-            result = self.process_document(text, reference_date)
+            result = self.process_document(
+                text, reference_date, subdivision=subdivision, municipality=municipality
+            )
 
             # Add file metadata
             result["filename"] = filename
@@ -441,7 +649,9 @@ class DeadlineManagerAgent:
         except Exception as e:
             return {"error": f"File processing error: {e!s}"}
 
-    def batch_process_folder(self, folder_path, reference_date=None):
+    def batch_process_folder(
+        self, folder_path, reference_date=None, subdivision=None, municipality=None
+    ):
         """Process all supported files in a folder"""
         folder = Path(folder_path)
         if not folder.exists():
@@ -455,7 +665,9 @@ class DeadlineManagerAgent:
                 file_path.suffix.lower() in supported_extensions
                 and not file_path.name.startswith(".")
             ):
-                result = self.process_file(file_path, reference_date)
+                result = self.process_file(
+                    file_path, reference_date, subdivision, municipality
+                )
                 results.append(result)
 
         return {
@@ -473,7 +685,18 @@ class DeadlineManagerAgent:
             results_list = results
 
         total_docs = len(results_list)
-        successful = len([r for r in results_list if "deadline" in r])
+        deadlines = [r["deadline"] for r in results_list if "deadline" in r]
+        successful = len(deadlines)
+
+        # Urgency in working days, classified for all deadlines at once
+        _, urgency_labels = classify_urgency_many(deadlines)
+        urgency_breakdown = {
+            level: int((urgency_labels == level).sum()) for level in URGENCY_LEVELS
+        }
+
+        # Busiest deadline day, from a bincount over deadline dates
+        per_day = workload_counts(deadlines)
+        peak = int(per_day["per_day"].argmax())
 
         # Time savings calculation
         manual_time_per_doc = 15  # minutes
@@ -498,31 +721,63 @@ class DeadlineManagerAgent:
             "total_value": cost_savings + risk_reduction_value,
             "processing_capacity_per_hour": 60 / ai_time_per_doc,
             "annual_value_projection": (cost_savings + risk_reduction_value) * 52,
+            "urgency_breakdown": urgency_breakdown,
+            "peak_day": per_day["days"][peak].item() if deadlines else None,
+            "peak_day_deadlines": int(per_day["per_day"][peak]),
         }
 
 
 # Convenience functions for direct use
-def create_agent(ai_model: Literal["gemini-pro", "gemini-2.0-flash-001"] = "gemini-pro"):
+def create_agent(
+    ai_model: Literal["gemini-pro", "gemini-2.0-flash-001"] = "gemini-pro",
+):
     """Create a new DeadlineManagerAgent instance"""
     return DeadlineManagerAgent(ai_model=ai_model)
 
 
-def process_text(text, reference_date=None, ai_model: Literal["gemini-pro", "gemini-2.0-flash-001"] = "gemini-pro"):
+def process_text(
+    text,
+    reference_date=None,
+    ai_model: Literal["gemini-pro", "gemini-2.0-flash-001"] = "gemini-pro",
+    subdivision=None,
+    municipality=None,
+    multi_match=False,
+):
     """Quick function to process text"""
     agent = create_agent(ai_model)
-    return agent.process_document(text, reference_date)
-
-
-def process_file(file_path, reference_date=None, ai_model: Literal["gemini-pro", "gemini-2.0-flash-001"] = "gemini-pro"):
+    return agent.process_document(
+        text,
+        reference_date,
+        subdivision=subdivision,
+        municipality=municipality,
+        multi_match=multi_match,
+    )
+
+
+def process_file(
+    file_path,
+    reference_date=None,
+    ai_model: Literal["gemini-pro", "gemini-2.0-flash-001"] = "gemini-pro",
+    subdivision=None,
+    municipality=None,
+):
     """Quick function to process a file"""
     agent = create_agent(ai_model)
-    return agent.process_file(file_path, reference_date)
+    return agent.process_file(file_path, reference_date, subdivision, municipality)
 
 
-def process_folder(folder_path, reference_date=None, ai_model: Literal["gemini-pro", "gemini-2.0-flash-001"] = "gemini-pro"):
+def process_folder(
+    folder_path,
+    reference_date=None,
+    ai_model: Literal["gemini-pro", "gemini-2.0-flash-001"] = "gemini-pro",
+    subdivision=None,
+    municipality=None,
+):
     """Quick function to process all files in a folder"""
     agent = create_agent(ai_model)
-    return agent.batch_process_folder(folder_path, reference_date)
+    return agent.batch_process_folder(
+        folder_path, reference_date, subdivision, municipality
+    )
 
 
 # Example usage and testing
@@ -533,7 +788,7 @@ if __name__ == "__main__":
 
     test_cases = [
         "To Do: IES ACE - enviar declaração até 15 de abril",
-        "To Do: SAF-T - entregar ficheiro até dia 25 do mês seguinte", 
+        "To Do: SAF-T - entregar ficheiro até dia 25 do mês seguinte",
         "Deve responder no prazo de 15 dias úteis a partir desta notificação",
         "To Do: Declaração IVA - prazo trimestral",
     ]
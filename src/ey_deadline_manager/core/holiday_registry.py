@@ -0,0 +1,256 @@
+"""
+EY AI Challenge - Holiday Calendar Registry
+Process-wide, thread-safe cache of holiday calendars and working-day indexes
+"""
+
+import threading
+from datetime import date
+from functools import lru_cache
+
+import holidays
+
+from .business_days import BusinessDayCalendar
+from .holiday_snapshot import SNAPSHOT
+from .suspension import SuspensionCalendar, judicial_vacations
+
+# Short names accepted for the autonomous regions
+REGION_ALIASES = {
+    "acores": "20",
+    "açores": "20",
+    "azores": "20",
+    "madeira": "30",
+}
+
+
+@lru_cache(maxsize=256)
+def resolve_location(country="PT", subdivision=None, municipality=None):
+    """Canonicalize a location into a ``(country, subdivision, municipality)`` key.
+
+    ``subdivision`` accepts a ``holidays`` subdivision code or alias (districts,
+    "20" for the Açores, "30" for Madeira, or a short region name).
+    ``municipality`` names a municipality whose own holiday the ``holidays``
+    package models through its district subdivision (the district capitals,
+    e.g. Lisboa or Porto) and is mapped to that district code, which is also
+    accepted directly.
+    """
+    country_class = holidays.country_holidays(country).__class__
+    aliases = {
+        name.casefold(): code
+        for name, code in getattr(country_class, "subdivisions_aliases", {}).items()
+    }
+    codes = set(getattr(country_class, "subdivisions", ()))
+
+    if subdivision is not None:
+        key = str(subdivision).casefold()
+        subdivision = (
+            str(subdivision)
+            if str(subdivision) in codes
+            else aliases.get(key, REGION_ALIASES.get(key))
+        )
+        if subdivision is None:
+            raise ValueError(f"Unknown subdivision for {country}: {key!r}")
+
+    if municipality is not None:
+        municipality_code = (
+            str(municipality)
+            if str(municipality) in codes
+            else aliases.get(str(municipality).casefold())
+        )
+        if municipality_code is None or municipality_code in REGION_ALIASES.values():
+            raise ValueError(f"Unsupported municipality for {country}: {municipality}")
+        municipality = municipality_code
+
+    return country, subdivision, municipality
+
+
+class HolidayCalendarRegistry:
+    """Memoized holiday calendars shared by every agent in the process.
+
+    Calendars are keyed by ``(country, subdivision, municipality)``. Each one
+    is built once and its years are expanded on demand under a lock, so
+    concurrent readers never trigger the ``holidays`` package's lazy
+    expansion themselves. Which years are fully expanded is tracked by the
+    registry: ``holidays`` lists a year in ``years`` before populating it, so
+    that set cannot tell a finished year from one still being filled.
+    Compiled ``BusinessDayCalendar`` indexes are cached per location and
+    year range in the same way.
+
+    ``generation`` counts ``clear`` calls, so results derived from the
+    calendars can be cached against it.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._holiday_calendars = {}
+        # (location key, year) pairs whose expansion has finished
+        self._expanded_years = set()
+        self._business_calendars = {}
+        self._suspension_calendars = {}
+
+    def get_holiday_calendar(
+        self, country="PT", years=(), subdivision=None, municipality=None
+    ):
+        """Return the shared holiday calendar with ``years`` already expanded"""
+        key = resolve_location(country, subdivision, municipality)
+        holiday_calendar = self._holiday_calendars.get(key)
+        missing_years = [
+            year for year in years if (key, year) not in self._expanded_years
+        ]
+        if holiday_calendar is not None and not missing_years:
+            return holiday_calendar
+
+        with self._lock:
+            holiday_calendar = self._holiday_calendars.get(key)
+            if holiday_calendar is None:
+                holiday_calendar = self._build_holiday_calendar(*key)
+                self._holiday_calendars[key] = holiday_calendar
+            for year in missing_years:
+                # A membership test expands the year in place
+                _ = date(year, 1, 1) in holiday_calendar
+                self._expanded_years.add((key, year))
+        return holiday_calendar
+
+    @staticmethod
+    def _build_holiday_calendar(country, subdivision, municipality):
+        holiday_calendar = holidays.country_holidays(country, subdiv=subdivision)
+        if municipality is not None and municipality != subdivision:
+            # National + regional holidays plus the municipal ones
+            holiday_calendar = holiday_calendar + holidays.country_holidays(
+                country, subdiv=municipality
+            )
+        return holiday_calendar
+
+    def get_business_calendar(
+        self, start_year, end_year, country="PT", subdivision=None, municipality=None
+    ):
+        """Return the shared working-day index for an inclusive year range.
+
+        Each (location, year range) combination is compiled exactly once.
+        """
+        location = resolve_location(country, subdivision, municipality)
+        key = (*location, start_year, end_year)
+        business_calendar = self._business_calendars.get(key)
+        if business_calendar is not None:
+            return business_calendar
+
+        with self._lock:
+            business_calendar = self._business_calendars.get(key)
+            if business_calendar is None:
+                if location == ("PT", None, None) and (
+                    SNAPSHOT is not None and SNAPSHOT.covers(start_year, end_year)
+                ):
+                    # National calendar compiled from the shipped snapshot
+                    business_calendar = BusinessDayCalendar(start_year, end_year)
+                else:
+                    holiday_calendar = self.get_holiday_calendar(
+                        location[0],
+                        range(start_year, end_year + 1),
+                        location[1],
+                        location[2],
+                    )
+                    business_calendar = BusinessDayCalendar(
+                        start_year, end_year, holiday_calendar
+                    )
+                self._business_calendars[key] = business_calendar
+        return business_calendar
+
+    def get_judicial_calendar(
+        self,
+        start_year,
+        end_year,
+        working_days=True,
+        country="PT",
+        subdivision=None,
+        municipality=None,
+    ):
+        """Return the shared calendar that suspends counting in judicial holidays.
+
+        Counts working days of the location's calendar, or every calendar day
+        when ``working_days`` is false.
+        """
+        location = resolve_location(country, subdivision, municipality)
+        key = (*location, start_year, end_year, working_days)
+        suspension_calendar = self._suspension_calendars.get(key)
+        if suspension_calendar is not None:
+            return suspension_calendar
+
+        with self._lock:
+            suspension_calendar = self._suspension_calendars.get(key)
+            if suspension_calendar is None:
+                business_calendar = (
+                    self.get_business_calendar(start_year, end_year, *location)
+                    if working_days
+                    else None
+                )
+                suspension_calendar = SuspensionCalendar(
+                    start_year,
+                    end_year,
+                    judicial_vacations(start_year, end_year),
+                    business_calendar,
+                )
+                self._suspension_calendars[key] = suspension_calendar
+        return suspension_calendar
+
+    def clear(self):
+        """Drop every cached calendar"""
+        with self._lock:
+            self._holiday_calendars.clear()
+            self._expanded_years.clear()
+            self._business_calendars.clear()
+            self._suspension_calendars.clear()
+            self.generation += 1
+
+
+# Process-wide registry used by the agent and the module-level helpers
+default_registry = HolidayCalendarRegistry()
+
+
+def get_holiday_calendar(country="PT", years=(), subdivision=None, municipality=None):
+    """Shared holiday calendar from the process-wide registry"""
+    return default_registry.get_holiday_calendar(
+        country, years, subdivision, municipality
+    )
+
+
+def get_business_calendar(
+    start_year, end_year, country="PT", subdivision=None, municipality=None
+):
+    """Shared working-day index from the process-wide registry"""
+    return default_registry.get_business_calendar(
+        start_year, end_year, country, subdivision, municipality
+    )
+
+
+def get_judicial_calendar(
+    start_year,
+    end_year,
+    working_days=True,
+    country="PT",
+    subdivision=None,
+    municipality=None,
+):
+    """Shared judicial-holiday suspension calendar from the process-wide registry"""
+    return default_registry.get_judicial_calendar(
+        start_year, end_year, working_days, country, subdivision, municipality
+    )
+
+
+def is_working_day(day, country="PT", subdivision=None, municipality=None):
+    """Check whether a date is a working day.
+
+    National Portuguese dates inside the compiled snapshot are a single bit
+    test; other years and locations fall back to the shared holiday calendar.
+    """
+    location = resolve_location(country, subdivision, municipality)
+    if (
+        location == ("PT", None, None)
+        and SNAPSHOT is not None
+        and SNAPSHOT.covers(day.year)
+    ):
+        return SNAPSHOT.is_working_day(day)
+
+    holiday_calendar = get_holiday_calendar(
+        country, [day.year], subdivision, municipality
+    )
+    return day.weekday() < 5 and day not in holiday_calendar
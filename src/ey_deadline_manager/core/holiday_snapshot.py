@@ -0,0 +1,131 @@
+"""
+EY AI Challenge - Compiled Holiday Snapshot
+Per-year working-day bitsets shipped with the package for instant cold start
+
+File layout (little endian): a header with magic, format version, first year
+and year count, followed by one 368-bit (46-byte) mask per year where bit
+``n`` is set when day ``n`` of the year (0-based) is a Portuguese working day.
+
+Regenerate the shipped snapshot with::
+
+    python -m ey_deadline_manager.core.holiday_snapshot 2000 2060
+"""
+
+import mmap
+import struct
+import sys
+from datetime import date
+from pathlib import Path
+
+import holidays
+import numpy as np
+
+SNAPSHOT_PATH = Path(__file__).parent / "data" / "holidays_pt.bin"
+
+SNAPSHOT_MAGIC = b"PTHS"
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct("<4sHHH")
+# 366 days rounded up to whole bytes
+BYTES_PER_YEAR = 46
+
+
+def build_snapshot(path, start_year, end_year, holiday_calendar=None):
+    """Compile working-day bitsets for ``start_year``..``end_year`` into ``path``"""
+    if end_year < start_year:
+        raise ValueError(f"Invalid snapshot range: {start_year} is after {end_year}")
+    if holiday_calendar is None:
+        holiday_calendar = holidays.Portugal(years=range(start_year, end_year + 1))
+
+    masks = []
+    for year in range(start_year, end_year + 1):
+        first_ordinal = date(year, 1, 1).toordinal()
+        days_in_year = date(year, 12, 31).toordinal() - first_ordinal + 1
+        bits = np.zeros(BYTES_PER_YEAR * 8, dtype=bool)
+        for day_index in range(days_in_year):
+            day = date.fromordinal(first_ordinal + day_index)
+            bits[day_index] = day.weekday() < 5 and day not in holiday_calendar
+        masks.append(np.packbits(bits, bitorder="little").tobytes())
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(
+            HEADER.pack(
+                SNAPSHOT_MAGIC,
+                SNAPSHOT_VERSION,
+                start_year,
+                end_year - start_year + 1,
+            )
+        )
+        f.write(b"".join(masks))
+    return path
+
+
+class HolidaySnapshot:
+    """Read-only, memory-mapped view over a compiled holiday snapshot"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.first_year, year_count = HEADER.unpack_from(self._buffer)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported holiday snapshot: {path}")
+        if len(self._buffer) != HEADER.size + year_count * BYTES_PER_YEAR:
+            raise ValueError(f"Truncated holiday snapshot: {path}")
+        self.last_year = self.first_year + year_count - 1
+
+    def covers(self, start_year, end_year=None):
+        """Check whether every year of the range is in the snapshot"""
+        end_year = start_year if end_year is None else end_year
+        return self.first_year <= start_year and end_year <= self.last_year
+
+    def is_working_day(self, day):
+        """Bit test for a single date; raises ``ValueError`` outside the snapshot"""
+        if not self.covers(day.year):
+            raise ValueError(f"Year {day.year} is outside the holiday snapshot")
+        day_index = day.toordinal() - date(day.year, 1, 1).toordinal()
+        offset = (
+            HEADER.size + (day.year - self.first_year) * BYTES_PER_YEAR + day_index // 8
+        )
+        return bool(self._buffer[offset] >> (day_index % 8) & 1)
+
+    def working_ordinals(self, start_year, end_year):
+        """Sorted ordinals of every working day in an inclusive year range"""
+        if not self.covers(start_year, end_year):
+            raise ValueError(
+                f"Years {start_year}-{end_year} are outside the holiday snapshot"
+            )
+        masks = np.frombuffer(
+            self._buffer,
+            dtype=np.uint8,
+            count=(end_year - start_year + 1) * BYTES_PER_YEAR,
+            offset=HEADER.size + (start_year - self.first_year) * BYTES_PER_YEAR,
+        ).reshape(-1, BYTES_PER_YEAR)
+        bits = np.unpackbits(masks, axis=1, bitorder="little")
+
+        ordinals = []
+        for year, year_bits in zip(range(start_year, end_year + 1), bits, strict=True):
+            ordinals.append(np.flatnonzero(year_bits) + date(year, 1, 1).toordinal())
+        return np.concatenate(ordinals).tolist()
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """Memory-map the shipped snapshot, or return ``None`` when unavailable"""
+    try:
+        return HolidaySnapshot(path)
+    except (OSError, ValueError):
+        return None
+
+
+# Loaded once at import; mapping the file is lazy, so this costs no I/O
+SNAPSHOT = load_snapshot()
+
+
+if __name__ == "__main__":
+    first, last = (
+        (int(arg) for arg in sys.argv[1:3]) if len(sys.argv) > 2 else (2000, 2060)
+    )
+    print(
+        f"✅ Holiday snapshot written to {build_snapshot(SNAPSHOT_PATH, first, last)}"
+    )
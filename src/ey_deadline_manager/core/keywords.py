@@ -0,0 +1,70 @@
+"""
+EY AI Challenge - Keyword Automaton
+Single-pass detection of every trigger keyword and pattern in a document
+"""
+
+import re
+
+
+def _trie_pattern(words):
+    """Regex walking a character trie of ``words``, preferring the longest match"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        group = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A word ending here is still a match when no longer word continues
+        return f"(?:{group})?" if "" in node else group
+
+    return build(trie)
+
+
+class KeywordAutomaton:
+    """Trie-compiled matcher finding every keyword in one pass over the text.
+
+    Keywords are compiled into a single trie-shaped regex, so the text is
+    walked once down the trie rather than scanned once per keyword. After
+    each match the scan resumes one character later, so overlapping
+    keywords are still seen, and the longest keyword found at a position
+    also stands for every keyword contained in it (``"declaracao mensal"``
+    implies ``"declaracao"``).
+    """
+
+    def __init__(self, keywords):
+        keywords = sorted(set(keywords), key=len, reverse=True)
+        self.keywords = tuple(keywords)
+        self._implied = {
+            keyword: frozenset(other for other in keywords if other in keyword)
+            for keyword in keywords
+        }
+        self._regex = re.compile(_trie_pattern(keywords))
+
+    def finditer(self, text):
+        """Yield ``(start, keyword)`` for the longest keyword at each match position"""
+        search = self._regex.search
+        match = search(text)
+        while match is not None:
+            yield match.start(), match.group()
+            match = search(text, match.start() + 1)
+
+    def implied(self, keyword):
+        """Every keyword contained in ``keyword``, itself included"""
+        return self._implied[keyword]
+
+    def scan(self, text):
+        """Set of keywords occurring anywhere in ``text``"""
+        hits = set()
+        for _, keyword in self.finditer(text):
+            hits |= self._implied[keyword]
+        return hits
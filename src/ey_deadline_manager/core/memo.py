@@ -0,0 +1,96 @@
+"""
+EY AI Challenge - Rule Evaluation Memo
+Bounded LRU cache of rule results keyed by content hash, reference date and versions
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+
+from .holiday_registry import default_registry
+from .normalize import normalize_text
+
+# Rule evaluations kept in the process-wide memo
+RULE_MEMO_SIZE = 1024
+
+
+class RuleMemo:
+    """Thread-safe bounded LRU memo of rule evaluation results.
+
+    Keys combine the document's content hash with the reference day, the
+    holiday location, the rule table version and the holiday registry
+    generation, so editing ``tax_rules.json`` or clearing the calendars makes
+    every older entry unreachable without an explicit flush; stale entries
+    simply age out. Results are deep-copied in and out because callers
+    annotate the dicts they get back.
+    """
+
+    def __init__(self, maxsize=RULE_MEMO_SIZE, registry=default_registry):
+        self.maxsize = maxsize
+        self.registry = registry
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, kind, text, reference_date, subdivision, municipality, version):
+        """Memo key of one evaluation of ``text`` under rule table ``version``"""
+        return (
+            kind,
+            normalize_text(text).digest,
+            reference_date,
+            subdivision,
+            municipality,
+            version,
+            self.registry.generation,
+        )
+
+    def get(self, key, compute, cacheable=None):
+        """Memoized ``compute()`` for ``key``.
+
+        A computed value is only stored when ``cacheable(value)`` is true (by
+        default always), so transient failures can be retried.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._entries[key])
+            self.misses += 1
+
+        # Computed outside the lock; a concurrent miss on the same key
+        # computes the same value twice, which is harmless
+        value = compute()
+        if cacheable is not None and not cacheable(value):
+            return value
+        with self._lock:
+            self._entries[key] = copy.deepcopy(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Process-wide memo shared by every agent (Streamlit builds one per request)
+default_rule_memo = RuleMemo()
+# Reference-free extractions (AI specifications), valid for any reference date
+default_spec_memo = RuleMemo()
@@ -0,0 +1,136 @@
+"""
+EY AI Challenge - Pipeline Metrics
+Low-overhead per-rule counters and per-stage latency histograms
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+
+# Upper bounds of the latency buckets in milliseconds; slower calls overflow
+LATENCY_BUCKETS_MS = (
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+)
+
+# Counter groups reported by ``PipelineMetrics.snapshot``
+COUNTER_GROUPS = ("outcomes", "templates", "rules", "routing", "ai")
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram: one bisect and three adds per sample"""
+
+    __slots__ = ("counts", "samples", "total_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.samples = 0
+        self.total_ms = 0.0
+
+    def observe(self, milliseconds):
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, milliseconds)] += 1
+        self.samples += 1
+        self.total_ms += milliseconds
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the ``q`` quantile (``inf`` on overflow)"""
+        if not self.samples:
+            return 0.0
+        rank = q * self.samples
+        seen = 0
+        for bound, count in zip(
+            (*LATENCY_BUCKETS_MS, float("inf")), self.counts, strict=True
+        ):
+            seen += count
+            if seen >= rank:
+                return float(bound)
+        return float("inf")
+
+    def snapshot(self):
+        return {
+            "count": self.samples,
+            "total_ms": self.total_ms,
+            "mean_ms": self.total_ms / self.samples if self.samples else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets": dict(
+                zip((*LATENCY_BUCKETS_MS, float("inf")), self.counts, strict=True)
+            ),
+        }
+
+
+class PipelineMetrics:
+    """Thread-safe counters and stage timings of the deadline pipeline.
+
+    ``outcomes`` counts how each document was resolved (``template``,
+    ``rule_based``, ``date_extraction``, ``classifier``, ``ai_inference`` or
+    ``failed``), ``templates`` and ``rules`` count hits per AT template and
+    rule id, ``routing`` counts the classifier's routes, and ``ai`` counts
+    model calls, memo hits and the kind of specification the model returned.
+    Stage latencies go into ``LatencyHistogram`` buckets, so recording costs
+    a lock and a bisect.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Zero every counter and histogram"""
+        with self._lock:
+            self._counters = {group: Counter() for group in COUNTER_GROUPS}
+            self._latency = {}
+
+    def increment(self, group, name, amount=1):
+        """Add ``amount`` to counter ``name`` of ``group``"""
+        with self._lock:
+            self._counters[group][name] += amount
+
+    def observe(self, stage, seconds):
+        """Record one ``stage`` duration"""
+        with self._lock:
+            histogram = self._latency.get(stage)
+            if histogram is None:
+                histogram = self._latency[stage] = LatencyHistogram()
+            histogram.observe(seconds * 1000)
+
+    @contextmanager
+    def timer(self, stage):
+        """Time the enclosed block as one ``stage`` sample"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def snapshot(self):
+        """Plain-dict copy of every counter and latency summary"""
+        with self._lock:
+            snapshot = {
+                group: dict(counter) for group, counter in self._counters.items()
+            }
+            snapshot["latency"] = {
+                stage: histogram.snapshot()
+                for stage, histogram in self._latency.items()
+            }
+        return snapshot
+
+
+# Process-wide metrics recorded by every agent
+default_metrics = PipelineMetrics()
@@ -0,0 +1,177 @@
+"""
+EY AI Challenge - Text Normalization
+Canonical document text computed once per document and cached by content hash
+"""
+
+import hashlib
+import re
+import sys
+import threading
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+# Memory budget of the canonical forms kept for reuse, counting each
+# document's original and canonical text and its offsets
+NORMALIZE_CACHE_BYTES = 64 * 2**20
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(char):
+    """Canonical form of one character: casefolded, no diacritics, no ligatures"""
+    if char.isspace():
+        return " "
+    # NFKD splits ligatures ("ﬁ" -> "fi") and separates accents from letters
+    decomposed = unicodedata.normalize("NFKD", char)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def strip_diacritics(text):
+    """``text`` without combining accents, otherwise unchanged"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return unicodedata.normalize(
+        "NFC", "".join(c for c in decomposed if not unicodedata.combining(c))
+    )
+
+
+class NormalizedText:
+    """Canonical form of a document with offsets back into the original.
+
+    ``text`` is casefolded, stripped of diacritics, free of OCR ligatures and
+    has every whitespace run collapsed to one space, so matchers need a
+    single unaccented lowercase spelling of each keyword. ``digest`` is the
+    content hash of the original text.
+
+    Offsets back into the original are stored only where they stop advancing
+    one by one (whitespace runs, ligatures, dropped accents), so plain prose
+    costs a few bytes per edit rather than per character.
+    """
+
+    __slots__ = ("_origins", "_starts", "digest", "original", "text")
+
+    def __init__(self, original):
+        self.original = original
+        self.digest = hashlib.blake2b(
+            original.encode("utf-8", "surrogatepass"), digest_size=16
+        ).hexdigest()
+
+        pieces = list(map(_fold_char, original))
+        # Collapse each whitespace run to its first character, dropping runs
+        # at either end
+        for run in _WHITESPACE.finditer(original):
+            start, end = run.span()
+            pieces[start + 1 : end] = [""] * (end - start - 1)
+            if start == 0 or end == len(original):
+                pieces[start] = ""
+
+        self.text = "".join(pieces)
+        # Original index of every canonical character, kept at the canonical
+        # positions where it does not follow on from the previous one
+        lengths = np.fromiter(map(len, pieces), dtype=np.int32, count=len(pieces))
+        offsets = np.repeat(np.arange(len(pieces), dtype=np.int32), lengths)
+        breaks = np.ones(len(offsets), dtype=bool)
+        breaks[1:] = np.diff(offsets) != 1
+        self._starts = np.flatnonzero(breaks).astype(np.int32)
+        self._origins = offsets[self._starts]
+
+    def _original_offset(self, position):
+        index = int(np.searchsorted(self._starts, position, side="right")) - 1
+        return int(self._origins[index]) + position - int(self._starts[index])
+
+    def original_span(self, start, end):
+        """Span in the original text covering canonical ``text[start:end]``"""
+        if start >= end:
+            offset = (
+                self._original_offset(start)
+                if start < len(self.text)
+                else len(self.original)
+            )
+            return offset, offset
+        return self._original_offset(start), self._original_offset(end - 1) + 1
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by this object, the original text included"""
+        return (
+            sys.getsizeof(self.original)
+            + sys.getsizeof(self.text)
+            + self._starts.nbytes
+            + self._origins.nbytes
+        )
+
+    def __len__(self):
+        return len(self.text)
+
+    def __repr__(self):
+        return f"NormalizedText({self.text[:40]!r}, digest={self.digest[:12]!r})"
+
+
+class SizedCache:
+    """Thread-safe LRU cache bounded by the total size of its values.
+
+    ``sizeof(value)`` gives each value's size; least recently used entries
+    are evicted once the sizes add up to more than ``maxbytes``, and a value
+    larger than the whole budget is returned without being stored.
+    """
+
+    def __init__(self, maxbytes, sizeof):
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        """Cached ``compute()`` for ``key``"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+
+        # Computed outside the lock; a concurrent miss on the same key keeps
+        # the value stored first
+        value = compute()
+        size = self.sizeof(value)
+        if size > self.maxbytes:
+            return value
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key][0]
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.maxbytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+        return value
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_normalize_cache = SizedCache(NORMALIZE_CACHE_BYTES, lambda value: value.nbytes)
+
+
+def normalize_text(text):
+    """Canonical ``NormalizedText`` of ``text``, computed once per distinct content.
+
+    Every consumer (rule engine, date extractor, AI prompt) calls this with
+    the raw document, so the normalization itself runs once per document and
+    later calls are a cache lookup. The cache keeps at most
+    ``NORMALIZE_CACHE_BYTES`` of documents.
+    """
+    return _normalize_cache.get(text, lambda: NormalizedText(text))
+
+
+def fold_keyword(keyword):
+    """Canonical spelling of a matcher keyword"""
+    return normalize_text(keyword).text
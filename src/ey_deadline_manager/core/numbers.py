@@ -0,0 +1,74 @@
+"""
+EY AI Challenge - Portuguese Number Words
+Recognizer for day counts written as digits or words ("vinte e cinco")
+"""
+
+import re
+
+# Cardinal words up to one hundred, in canonical (unaccented) form, with the
+# European and Brazilian spellings of the teens
+UNITS = {
+    "um": 1,
+    "uma": 1,
+    "dois": 2,
+    "duas": 2,
+    "tres": 3,
+    "quatro": 4,
+    "cinco": 5,
+    "seis": 6,
+    "sete": 7,
+    "oito": 8,
+    "nove": 9,
+}
+TEENS = {
+    "dez": 10,
+    "onze": 11,
+    "doze": 12,
+    "treze": 13,
+    "catorze": 14,
+    "quatorze": 14,
+    "quinze": 15,
+    "dezasseis": 16,
+    "dezesseis": 16,
+    "dezassete": 17,
+    "dezessete": 17,
+    "dezoito": 18,
+    "dezanove": 19,
+    "dezenove": 19,
+}
+TENS = {
+    "vinte": 20,
+    "trinta": 30,
+    "quarenta": 40,
+    "cinquenta": 50,
+    "sessenta": 60,
+    "setenta": 70,
+    "oitenta": 80,
+    "noventa": 90,
+}
+NUMBER_WORDS = {**UNITS, **TEENS, **TENS, "cem": 100}
+
+
+def _alternation(words):
+    return "|".join(sorted(words, key=len, reverse=True))
+
+
+# Digits, or a number word with an optional "e <unit>" for the tens. Used for
+# ``{number}`` in rule patterns; words need a word boundary, digits do not
+NUMBER_PATTERN = (
+    r"(?:\d+|\b(?:"
+    rf"(?:{_alternation(TENS)})(?:\s+e\s+(?:{_alternation(UNITS)}))?"
+    rf"|{_alternation(TEENS)}|{_alternation(UNITS)}|cem"
+    r")\b)"
+)
+
+_NUMBER = re.compile(NUMBER_PATTERN)
+
+
+def parse_number(text):
+    """Value of a ``NUMBER_PATTERN`` match (``"25"`` or ``"vinte e cinco"``)"""
+    if text.isdigit():
+        return int(text)
+    if _NUMBER.fullmatch(text) is None:
+        raise ValueError(f"Not a Portuguese number: {text!r}")
+    return sum(NUMBER_WORDS[word] for word in text.split() if word != "e")
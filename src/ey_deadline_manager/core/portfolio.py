@@ -0,0 +1,210 @@
+"""
+EY AI Challenge - Portfolio Obligation Matrix
+Client x obligation x period deadlines for whole client portfolios with NumPy
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .normalize import normalize_text
+from .schedule import iter_obligation_schedule
+from .tax_rules import recurring_obligations
+
+# Client-table flag column that makes each recurring obligation apply
+OBLIGATION_FLAGS = {
+    "modelo_22": "irs",
+    "ies": "ies",
+    "modelo_30": "employer",
+    "iva": "iva_quarterly",
+    "saf_t": "saf_t",
+    "dmr": "employer",
+}
+
+# Spellings accepted in flag columns, compared on canonical text
+FLAG_VALUES = {
+    "yes": True,
+    "sim": True,
+    "true": True,
+    "1": True,
+    "no": False,
+    "nao": False,
+    "false": False,
+    "0": False,
+}
+
+# Roll-forward never moves a deadline by more than a long holiday weekend
+ROLL_FORWARD_SLACK = timedelta(days=7)
+
+
+def obligation_periods(
+    start, end, obligations=None, subdivision=None, municipality=None
+):
+    """Deadlines of each obligation falling in ``start``..``end`` (inclusive).
+
+    Returns ``(deadline, original_deadline)`` ``datetime64[D]`` arrays shaped
+    ``(n_obligations, n_periods)``, padded with ``NaT`` where an obligation has
+    fewer periods than the most frequent one. Deadlines are rolled forward and
+    filtered on the rolled date.
+    """
+    obligations = list(recurring_obligations() if obligations is None else obligations)
+    first = datetime(start.year, start.month, start.day)
+    last = datetime(end.year, end.month, end.day)
+
+    rows = []
+    for obligation in obligations:
+        rows.append(
+            [
+                (
+                    result["deadline"],
+                    result.get("original_deadline", result["deadline"]),
+                )
+                for result in iter_obligation_schedule(
+                    obligation,
+                    first - ROLL_FORWARD_SLACK,
+                    last,
+                    subdivision,
+                    municipality,
+                )
+                if first <= result["deadline"] <= last
+            ]
+        )
+
+    n_periods = max((len(row) for row in rows), default=0)
+    deadline = np.full((len(obligations), n_periods), "NaT", dtype="datetime64[D]")
+    original_deadline = deadline.copy()
+    for index, row in enumerate(rows):
+        if row:
+            deadline[index, : len(row)], original_deadline[index, : len(row)] = zip(
+                *row, strict=True
+            )
+    return deadline, original_deadline
+
+
+def _flag_values(column):
+    """Boolean array of a flag column; empty cells are ``False``.
+
+    Accepts booleans, 0/1 and the yes/no spellings of ``FLAG_VALUES`` as read
+    from CSV files, and raises ``ValueError`` on anything else.
+    """
+    parsed = {}
+    for value in pd.unique(column.dropna()):
+        if isinstance(value, bool | np.bool_) or value in (0, 1):
+            parsed[value] = bool(value)
+            continue
+        key = normalize_text(str(value)).text
+        if key not in FLAG_VALUES:
+            raise ValueError(
+                f"Unknown value {value!r} in flag column {column.name!r}, "
+                "expected yes/no"
+            )
+        parsed[value] = FLAG_VALUES[key]
+    return column.map(parsed).eq(True).to_numpy()
+
+
+def _location_codes(clients):
+    """Factorize the optional subdivision/municipality columns into location codes"""
+    n_clients = len(clients)
+    if "subdivision" not in clients and "municipality" not in clients:
+        return np.zeros(n_clients, dtype=np.intp), [(None, None)]
+
+    columns = [
+        clients[column].astype(object).where(clients[column].notna(), None)
+        if column in clients
+        else pd.Series([None] * n_clients, index=clients.index)
+        for column in ("subdivision", "municipality")
+    ]
+    codes, locations = pd.factorize(pd.Series(list(zip(*columns, strict=True))))
+    return codes, list(locations) or [(None, None)]
+
+
+def portfolio_deadline_matrix(clients, start, end, obligations=None):
+    """Compute the full client x obligation x period deadline matrix.
+
+    ``clients`` is a DataFrame (or a mapping of columns) with one row per
+    client and flag columns named in ``OBLIGATION_FLAGS`` (booleans or the
+    yes/no spellings of ``FLAG_VALUES``); a missing flag column means the
+    obligation applies to nobody. Optional
+    ``subdivision``/``municipality`` columns select each client's holiday
+    calendar. Deadlines are computed once per obligation and location and
+    broadcast across clients, so the cost is a handful of array operations
+    regardless of portfolio size.
+
+    Returns a dict with the ``obligations`` tuple and ``deadline`` /
+    ``original_deadline`` ``datetime64[D]`` arrays shaped
+    ``(n_clients, n_obligations, n_periods)``, ``NaT`` where an obligation
+    does not apply or has no period.
+    """
+    clients = clients if isinstance(clients, pd.DataFrame) else pd.DataFrame(clients)
+    obligations = tuple(recurring_obligations() if obligations is None else obligations)
+    n_clients = len(clients)
+
+    applies = np.zeros((n_clients, len(obligations)), dtype=bool)
+    for index, obligation in enumerate(obligations):
+        flag = OBLIGATION_FLAGS.get(obligation, obligation)
+        if flag in clients:
+            applies[:, index] = _flag_values(clients[flag])
+
+    # One period table per distinct holiday calendar in the portfolio
+    codes, locations = _location_codes(clients)
+    tables = [
+        obligation_periods(start, end, obligations, subdivision, municipality)
+        for subdivision, municipality in locations
+    ]
+    n_periods = max(table[0].shape[1] for table in tables)
+    by_location = np.full(
+        (2, len(tables), len(obligations), n_periods), "NaT", dtype="datetime64[D]"
+    )
+    for index, (deadline, original_deadline) in enumerate(tables):
+        by_location[0, index, :, : deadline.shape[1]] = deadline
+        by_location[1, index, :, : deadline.shape[1]] = original_deadline
+
+    mask = applies[:, :, np.newaxis]
+    nat = np.datetime64("NaT", "D")
+    return {
+        "obligations": obligations,
+        "deadline": np.where(mask, by_location[0][codes], nat),
+        "original_deadline": np.where(mask, by_location[1][codes], nat),
+    }
+
+
+def upcoming_portfolio_deadlines(clients, days=90, today=None, obligations=None):
+    """What is due for every client in the next ``days`` days.
+
+    Returns a long DataFrame (one row per client, obligation and period)
+    sorted by deadline, with the client identifier taken from a ``client``
+    column when present and from the table index otherwise.
+    """
+    clients = clients if isinstance(clients, pd.DataFrame) else pd.DataFrame(clients)
+    today = today or datetime.now()
+    matrix = portfolio_deadline_matrix(
+        clients, today, today + timedelta(days=days), obligations
+    )
+
+    client_index, obligation_index, period_index = np.nonzero(
+        ~np.isnat(matrix["deadline"])
+    )
+    client_ids = (
+        clients["client"].to_numpy()
+        if "client" in clients
+        else clients.index.to_numpy()
+    )
+    obligations = matrix["obligations"]
+    table = pd.DataFrame(
+        {
+            "client": client_ids[client_index],
+            "obligation": pd.Categorical.from_codes(obligation_index, obligations),
+            "deadline": matrix["deadline"][
+                client_index, obligation_index, period_index
+            ],
+            "original_deadline": matrix["original_deadline"][
+                client_index, obligation_index, period_index
+            ],
+        }
+    )
+    specs = recurring_obligations()
+    for field in ("rule", "priority"):
+        values = [specs[obligation][field] for obligation in obligations]
+        table[field] = pd.Categorical(values).take(obligation_index)
+    return table.sort_values("deadline", kind="stable", ignore_index=True)
@@ -0,0 +1,86 @@
+"""
+EY AI Challenge - Recurring Obligation Schedule
+Lazy generation of every occurrence of recurring tax obligations over a horizon
+"""
+
+import heapq
+from datetime import datetime
+
+from .holiday_registry import get_business_calendar
+from .tax_rules import QUARTER_ENDS, RESULT_FIELDS, recurring_obligations
+
+QUARTER_END_DAYS = dict(QUARTER_ENDS)
+
+
+def _as_datetime(day):
+    """Midnight ``datetime`` for a ``date`` or ``datetime``"""
+    return datetime(day.year, day.month, day.day)
+
+
+def _due_dates(spec, start, end):
+    """Unadjusted due dates of an obligation between ``start`` and ``end``"""
+    year, month = start.year, start.month
+    while datetime(year, month, 1) <= end:
+        if spec["kind"] == "annual":
+            day = spec["day"] if month == spec["month"] else None
+        elif spec["kind"] == "monthly":
+            day = spec["day"]
+        elif spec["kind"] == "quarterly":
+            day = QUARTER_END_DAYS.get(month)
+        else:
+            raise ValueError(f"Not a recurring rule kind: {spec['kind']}")
+
+        if day is not None:
+            due = datetime(year, month, day)
+            if start <= due <= end:
+                yield due
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def iter_obligation_schedule(
+    obligation, start, end, subdivision=None, municipality=None
+):
+    """Lazily yield every occurrence of one recurring obligation.
+
+    ``obligation`` is the id of a recurring rule in the active rule table
+    (e.g. ``"saf_t"``). Occurrences whose unadjusted due date lies in
+    ``start``..``end`` (inclusive) are yielded in date order as result dicts
+    shaped like ``apply_portuguese_tax_rules()`` output plus the
+    ``obligation`` name.
+    Deadlines on weekends or holidays are rolled forward, keeping the
+    unadjusted date as ``original_deadline``.
+    """
+    spec = recurring_obligations()[obligation]
+    business_calendar = None
+    for due in _due_dates(spec, _as_datetime(start), _as_datetime(end)):
+        if business_calendar is None or due.year > business_calendar.start_year:
+            # One shared calendar per year; the next year covers roll-overs
+            business_calendar = get_business_calendar(
+                due.year, due.year + 1, "PT", subdivision, municipality
+            )
+
+        result = {"obligation": obligation, "deadline": due}
+        result.update({field: spec[field] for field in RESULT_FIELDS})
+        rolled = business_calendar.roll_forward(due)
+        if rolled != due:
+            result["original_deadline"] = due
+            result["deadline"] = rolled
+        yield result
+
+
+def iter_schedule(start, end, obligations=None, subdivision=None, municipality=None):
+    """Lazily merge the schedules of several obligations in deadline order.
+
+    ``obligations`` defaults to every recurring obligation of the rule table.
+    Only one pending occurrence per obligation is held in memory, so
+    multi-year, multi-client calendars can be streamed (chain one call per
+    client).
+    """
+    obligations = recurring_obligations() if obligations is None else obligations
+    return heapq.merge(
+        *(
+            iter_obligation_schedule(obligation, start, end, subdivision, municipality)
+            for obligation in obligations
+        ),
+        key=lambda result: result["deadline"],
+    )
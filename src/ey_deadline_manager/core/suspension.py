@@ -0,0 +1,141 @@
+"""
+EY AI Challenge - Deadline Suspension Engine
+Procedural deadline counting with suspension intervals (férias judiciais)
+"""
+
+from bisect import bisect_right
+from datetime import date, timedelta
+
+import numpy as np
+from dateutil.easter import easter
+
+from .business_days import EPOCH_ORDINAL
+
+JUDICIAL_SUSPENSION = "Férias judiciais - Lei n.º 62/2013, art. 28.º"
+
+
+def judicial_vacations(start_year, end_year):
+    """Judicial holiday intervals (inclusive) touching the given years.
+
+    Lei n.º 62/2013, art. 28.º: 22 December to 3 January, Palm Sunday to
+    Easter Monday and 16 July to 31 August.
+    """
+    intervals = [(date(start_year - 1, 12, 22), date(start_year, 1, 3))]
+    for year in range(start_year, end_year + 1):
+        easter_sunday = easter(year)
+        intervals.extend(
+            [
+                (easter_sunday - timedelta(days=7), easter_sunday + timedelta(days=1)),
+                (date(year, 7, 16), date(year, 8, 31)),
+                (date(year, 12, 22), date(year + 1, 1, 3)),
+            ]
+        )
+    return intervals
+
+
+def _merge_intervals(intervals):
+    """Sort and merge inclusive date intervals into ordinal start/end arrays"""
+    merged = []
+    for start, end in sorted((s.toordinal(), e.toordinal()) for s, e in intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    bounds = np.array(merged, dtype=np.int64).reshape(-1, 2)
+    return bounds[:, 0], bounds[:, 1]
+
+
+class SuspensionCalendar:
+    """Countable days of a calendar with suspension intervals removed.
+
+    Counts working days (using a ``BusinessDayCalendar``) or, when
+    ``business_calendar`` is ``None``, every calendar day between
+    ``start_year`` and ``end_year``. Suspension intervals are merged into a
+    sorted interval index once; the surviving days form a sorted ordinal
+    array, so adding days costs one bisect, as in plain working-day
+    arithmetic, and bulk offsets one ``searchsorted``.
+    """
+
+    def __init__(self, start_year, end_year, suspensions, business_calendar=None):
+        if business_calendar is not None:
+            start_year = max(start_year, business_calendar.start_year)
+            end_year = min(end_year, business_calendar.end_year)
+        if end_year < start_year:
+            raise ValueError(
+                f"Invalid calendar range: {start_year} is after {end_year}"
+            )
+
+        self.start_year = start_year
+        self.end_year = end_year
+        self.first_ordinal = date(start_year, 1, 1).toordinal()
+        self.last_ordinal = date(end_year, 12, 31).toordinal()
+        self.suspension_starts, self.suspension_ends = _merge_intervals(suspensions)
+
+        if business_calendar is not None:
+            candidates = np.array(business_calendar.working_ordinals, dtype=np.int64)
+            candidates = candidates[
+                (candidates >= self.first_ordinal) & (candidates <= self.last_ordinal)
+            ]
+        else:
+            candidates = np.arange(self.first_ordinal, self.last_ordinal + 1)
+
+        self.countable = candidates[~self.is_suspended_many(candidates)]
+        self.countable_ordinals = self.countable.tolist()
+
+    def is_suspended_many(self, ordinals):
+        """Vectorized interval-index lookup: is each ordinal suspended?"""
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        index = np.searchsorted(self.suspension_starts, ordinals, side="right") - 1
+        in_range = index >= 0
+        return in_range & (
+            ordinals <= self.suspension_ends[np.where(in_range, index, 0)]
+        )
+
+    def is_suspended(self, day):
+        """Check whether a date falls inside a suspension interval"""
+        return bool(self.is_suspended_many(day.toordinal()))
+
+    def _check_covered(self, ordinal):
+        if not self.first_ordinal <= ordinal <= self.last_ordinal:
+            raise ValueError(
+                f"Date {date.fromordinal(ordinal)} is outside calendar range"
+            )
+
+    def add_days(self, start_date, num_days):
+        """Add countable days to a date, skipping suspended periods.
+
+        Accepts ``date`` or ``datetime`` and preserves the time of day.
+        """
+        if num_days <= 0:
+            return start_date
+
+        start_ordinal = start_date.toordinal()
+        self._check_covered(start_ordinal)
+        index = bisect_right(self.countable_ordinals, start_ordinal) + num_days - 1
+        if index >= len(self.countable_ordinals):
+            raise ValueError(
+                f"Adding {num_days} days to {start_date} "
+                f"exceeds calendar range ending {self.end_year}"
+            )
+
+        return start_date + timedelta(
+            days=self.countable_ordinals[index] - start_ordinal
+        )
+
+    def add_days_many(self, starts, offsets):
+        """Vectorized ``add_days`` returning a ``datetime64[D]`` array"""
+        starts = np.asarray(starts, dtype="datetime64[D]")
+        offsets = np.asarray(offsets, dtype=np.int64)
+        ordinals = starts.astype(np.int64) + EPOCH_ORDINAL
+        if ordinals.size:
+            self._check_covered(int(ordinals.min()))
+            self._check_covered(int(ordinals.max()))
+
+        positive = offsets > 0
+        index = np.searchsorted(self.countable, ordinals, side="right") + offsets - 1
+        index = np.where(positive, index, 0)
+        if index.size and index.max() >= self.countable.size:
+            raise ValueError(f"Offsets exceed calendar range ending {self.end_year}")
+
+        shifted = (self.countable[index] - EPOCH_ORDINAL).astype("datetime64[D]")
+        return np.where(positive, shifted, starts)
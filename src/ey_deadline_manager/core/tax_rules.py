@@ -0,0 +1,555 @@
+"""
+EY AI Challenge - Portuguese Tax Rules
+Declarative rule table matching and reference-date independent resolution
+
+The rules live in a JSON table (``core/data/tax_rules.json`` by default, or
+the file named by ``TAX_RULES_PATH``) that is compiled once into a keyword
+automaton, anchored regexes and an ordered dispatch list, and recompiled and
+swapped atomically when the file changes.
+
+``match_tax_rule`` reads the text once and returns a rule specification that
+does not depend on any date. ``resolve_tax_rule`` turns it into a deadline
+for one reference date, and ``resolve_tax_rule_many`` does the same for an
+array of reference dates in a single vectorized pass.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+from .holiday_registry import get_business_calendar, get_judicial_calendar
+from .keywords import KeywordAutomaton
+from .normalize import fold_keyword, normalize_text, strip_diacritics
+from .numbers import NUMBER_PATTERN, parse_number
+from .suspension import JUDICIAL_SUSPENSION
+
+RULES_PATH = Path(
+    os.getenv("TAX_RULES_PATH", Path(__file__).parent / "data" / "tax_rules.json")
+)
+# Seconds between checks of the rule file for changes
+RELOAD_INTERVAL = 1.0
+
+RULE_KINDS = ("annual", "monthly", "quarterly", "working_days", "calendar_days")
+# Specifications can also name one absolute date (explicit or AI-extracted)
+SPEC_KINDS = (*RULE_KINDS, "fixed")
+QUARTER_ENDS = [(3, 31), (6, 30), (9, 30), (12, 31)]
+# Kinds of the recurring obligations, due on a calendar date of every period
+RECURRING_KINDS = ("annual", "monthly", "quarterly")
+# Entries each kind of trigger rule needs to be resolved; pattern rules
+# capture their day count instead
+RULE_PARAMETERS = {
+    "annual": ("month", "day"),
+    "monthly": ("day",),
+    "quarterly": (),
+    "working_days": ("days",),
+    "calendar_days": ("days",),
+}
+
+# Table entries that drive matching and are not part of the rule specification
+MATCHING_FIELDS = ("id", "triggers", "anchor", "prefix", "pattern", "suspendable")
+# How far back a pattern ``prefix`` may start before its anchor
+PREFIX_WINDOW = 200
+
+# Fields copied from a rule specification into every result
+RESULT_FIELDS = ("rule", "priority", "legal_basis", "confidence")
+
+
+def _keyword_set(term):
+    """Folded keywords of a trigger term (a keyword or a list of them)"""
+    keywords = [term] if isinstance(term, str) else term
+    if not (
+        isinstance(keywords, list)
+        and keywords
+        and all(isinstance(keyword, str) and keyword.strip() for keyword in keywords)
+    ):
+        raise ValueError(f"Invalid trigger term: {term!r}")
+    return frozenset(map(fold_keyword, keywords))
+
+
+def _compile_triggers(triggers):
+    """Compile trigger alternatives into tuples of keyword sets.
+
+    Each alternative is a keyword or a list of terms that must all be
+    present, where a term is a keyword or a list of interchangeable keywords.
+    Keywords are folded to the canonical spelling matched against. Raises
+    ``ValueError`` on anything else, such as a bare string for ``triggers``.
+    """
+    if not isinstance(triggers, list) or not triggers:
+        raise ValueError(f"Triggers must be a non-empty list, got {triggers!r}")
+    alternatives = []
+    for alternative in triggers:
+        terms = [alternative] if isinstance(alternative, str) else alternative
+        if not isinstance(terms, list) or not terms:
+            raise ValueError(f"Invalid trigger alternative: {alternative!r}")
+        alternatives.append(tuple(map(_keyword_set, terms)))
+    return tuple(alternatives)
+
+
+def _whole_word(text, start, end):
+    """Whether ``text[start:end]`` is not part of a longer word"""
+    return (start == 0 or not text[start - 1].isalnum()) and (
+        end == len(text) or not text[end].isalnum()
+    )
+
+
+def _expand_pattern(pattern):
+    """Rule regex over canonical text; ``{number}`` accepts digits or number words"""
+    return strip_diacritics(pattern).replace("{number}", NUMBER_PATTERN)
+
+
+class RuleTable:
+    """A rule table compiled for matching.
+
+    Rules are tried in table order, so the order is their precedence. Trigger
+    rules fire on keyword hits; pattern rules fire when their ``pattern``
+    regex matches at an ``anchor`` keyword (with an optional ``prefix`` regex
+    ending at the anchor) and capture the day count. Every trigger keyword
+    and anchor is found in one pass of a single ``KeywordAutomaton``.
+
+    Matching runs on the canonical text of ``normalize_text`` (casefolded,
+    unaccented, single-spaced), so each keyword needs one spelling; keywords
+    are folded and pattern accents stripped when the table is compiled.
+    """
+
+    def __init__(self, table, version=None):
+        self.version = version
+        self.suspension_keywords = frozenset(
+            map(fold_keyword, table.get("suspension_keywords", ()))
+        )
+        self.rules = [self._compile_rule(rule) for rule in table["rules"]]
+        self.obligations = {
+            rule["id"]: rule["spec"]
+            for rule in self.rules
+            if rule["spec"]["kind"] in RECURRING_KINDS
+        }
+
+        self._anchored = {}
+        keywords = set(self.suspension_keywords)
+        for rule in self.rules:
+            if "pattern" in rule:
+                self._anchored.setdefault(rule["anchor"], []).append(rule)
+                keywords.add(rule["anchor"])
+            for alternative in rule.get("triggers", ()):
+                keywords.update(*alternative)
+        self._anchors = frozenset(self._anchored)
+        self.automaton = KeywordAutomaton(keywords)
+
+    @staticmethod
+    def _validate_rule(rule):
+        """Raise ``ValueError`` unless ``rule`` can be matched and resolved"""
+        kind = rule.get("kind")
+        if kind not in RULE_KINDS:
+            raise ValueError(f"Unknown kind for rule {rule.get('id')}: {kind}")
+        required = ["id", *RESULT_FIELDS]
+        if "pattern" in rule:
+            required.append("anchor")
+        else:
+            required += ["triggers", *RULE_PARAMETERS[kind]]
+        missing = [field for field in required if field not in rule]
+        if missing:
+            raise ValueError(f"Rule {rule.get('id')} is missing {', '.join(missing)}")
+        if "pattern" in rule and kind in RECURRING_KINDS:
+            raise ValueError(f"Pattern rule {rule['id']} must count days, not {kind}")
+        if kind == "annual":
+            # A leap year, so that 29 February is accepted
+            datetime(2000, rule["month"], rule["day"])
+        elif kind == "monthly" and rule["day"] not in range(1, 29):
+            raise ValueError(
+                f"Monthly rule {rule['id']} must fall on day 1-28, got {rule['day']}"
+            )
+
+    @staticmethod
+    def _compile_rule(rule):
+        RuleTable._validate_rule(rule)
+
+        compiled = {
+            "id": rule["id"],
+            "spec": {
+                key: value for key, value in rule.items() if key not in MATCHING_FIELDS
+            },
+        }
+        if "pattern" in rule:
+            compiled["anchor"] = fold_keyword(rule["anchor"])
+            compiled["pattern"] = re.compile(_expand_pattern(rule["pattern"]))
+            # The prefix must end exactly at the anchor
+            compiled["prefix"] = (
+                re.compile(f"(?:{_expand_pattern(rule['prefix'])})\\Z")
+                if rule.get("prefix")
+                else None
+            )
+            compiled["suspendable"] = rule.get("suspendable", False)
+        else:
+            compiled["triggers"] = _compile_triggers(rule["triggers"])
+        return compiled
+
+    @staticmethod
+    def _capture(rule, text, start):
+        """``(start, end, days)`` of a pattern rule at anchor ``start``, or ``None``"""
+        match = rule["pattern"].match(text, start)
+        if not match:
+            return None
+        if rule["prefix"] is None:
+            return match.start(), match.end(), match.group(1)
+        prefix = rule["prefix"].search(text, max(start - PREFIX_WINDOW, 0), start)
+        if not prefix:
+            return None
+        return prefix.start(), match.end(), prefix.group(1)
+
+    def _scan(self, text, every_match=False):
+        """Single pass over canonical text collecting keyword and pattern positions.
+
+        Returns ``(hits, captures)`` where ``hits`` maps each keyword present to
+        the span of its first occurrence and ``captures`` maps each pattern
+        rule id to its ``(start, end, days)`` matches: the leftmost one only,
+        or all of them with ``every_match``. Suspension keywords only count as
+        whole words ("recurso", not "recursos humanos").
+        """
+        hits = {}
+        captures = {}
+        for start, keyword in self.automaton.finditer(text):
+            implied = self.automaton.implied(keyword)
+            for other in implied:
+                if other not in hits:
+                    other_start = start + keyword.find(other)
+                    other_end = other_start + len(other)
+                    if other in self.suspension_keywords and not _whole_word(
+                        text, other_start, other_end
+                    ):
+                        continue
+                    hits[other] = (other_start, other_end)
+            for anchor in implied & self._anchors:
+                for rule in self._anchored[anchor]:
+                    if not every_match and rule["id"] in captures:
+                        continue
+                    match = self._capture(rule, text, start + keyword.find(anchor))
+                    if match is not None:
+                        captures.setdefault(rule["id"], []).append(match)
+        return hits, captures
+
+    def scan(self, text):
+        """Find every trigger keyword and pattern capture in canonical ``text``.
+
+        Returns ``(hits, captures)``: the set of keywords present and, per
+        pattern rule id, the day count of its leftmost match. Patterns are
+        only tried at their anchors as the keyword scan reaches them.
+        """
+        hits, captures = self._scan(text)
+        return hits.keys(), {
+            rule_id: matches[0][2] for rule_id, matches in captures.items()
+        }
+
+    @staticmethod
+    def _pattern_spec(rule, days, suspended):
+        days = parse_number(days)
+        spec = dict(rule["spec"])
+        spec["days"] = days
+        spec["suspended"] = rule["suspendable"] and suspended
+        spec["rule"] = spec["rule"].format(days=days)
+        return spec
+
+    @staticmethod
+    def _trigger_span(rule, hits):
+        """Span of the first satisfied trigger alternative, or ``None``"""
+        for alternative in rule["triggers"]:
+            spans = [
+                min(hits[keyword] for keyword in term if keyword in hits)
+                for term in alternative
+                if not term.isdisjoint(hits.keys())
+            ]
+            if len(spans) == len(alternative):
+                return min(start for start, _ in spans), max(end for _, end in spans)
+        return None
+
+    def match(self, text):
+        """Specification (with its ``rule_id``) of the first rule that applies"""
+        hits, captures = self.scan(normalize_text(text).text)
+        # Procedural acts: deadlines are suspended during judicial holidays
+        suspended = not hits.isdisjoint(self.suspension_keywords)
+
+        for rule in self.rules:
+            if "pattern" in rule:
+                if rule["id"] not in captures:
+                    continue
+                spec = self._pattern_spec(rule, captures[rule["id"]], suspended)
+            elif any(
+                all(not term.isdisjoint(hits) for term in alternative)
+                for alternative in rule["triggers"]
+            ):
+                spec = dict(rule["spec"])
+            else:
+                continue
+            spec["rule_id"] = rule["id"]
+            return spec
+        return None
+
+    def match_all(self, text):
+        """Every rule that applies to ``text``, found in the same single pass.
+
+        Returns specifications in document order, each with its ``rule_id``
+        and the character ``span`` (start, end) in ``text`` that triggered it.
+        Trigger rules appear once; pattern rules once per match, and a
+        pattern match overlapping one of a higher-precedence rule is dropped
+        ("prazo de 30 dias úteis" is 30 working days, not also 30 days).
+        """
+        normalized = normalize_text(text)
+        hits, captures = self._scan(normalized.text, every_match=True)
+        suspended = not self.suspension_keywords.isdisjoint(hits)
+
+        candidates = []
+        claimed = []
+        for rule in self.rules:
+            if "pattern" in rule:
+                for start, end, days in captures.get(rule["id"], ()):
+                    if any(start < e and s < end for s, e in claimed):
+                        continue
+                    claimed.append((start, end))
+                    spec = self._pattern_spec(rule, days, suspended)
+                    candidates.append(((start, end), rule["id"], spec))
+            else:
+                span = self._trigger_span(rule, hits)
+                if span is not None:
+                    candidates.append((span, rule["id"], dict(rule["spec"])))
+
+        results = []
+        for (start, end), rule_id, spec in sorted(candidates, key=lambda c: c[0]):
+            spec["rule_id"] = rule_id
+            spec["span"] = normalized.original_span(start, end)
+            results.append(spec)
+        return results
+
+
+def load_rule_table(path=RULES_PATH):
+    """Read and compile a rule table file, versioned by its content hash"""
+    data = Path(path).read_bytes()
+    return RuleTable(json.loads(data), version=hashlib.sha256(data).hexdigest()[:12])
+
+
+class RuleTableLoader:
+    """Serves the active rule table and hot-swaps it when the file changes.
+
+    At most once per ``check_interval`` seconds a caller stats the file; when
+    it changed, the new table is compiled in full and then published with a
+    single reference assignment. Requests already holding the previous table
+    finish with it, and a file that fails to compile leaves the last good
+    table in place (the error is kept in ``last_error``).
+    """
+
+    def __init__(self, path=RULES_PATH, check_interval=RELOAD_INTERVAL):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._stamp = self._file_stamp()
+        self._table = load_rule_table(self.path)
+        self._next_check = time.monotonic() + check_interval
+
+    def _file_stamp(self):
+        stat = self.path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self):
+        """Return the active rule table, reloading it first if the file changed"""
+        if time.monotonic() >= self._next_check:
+            self.reload_if_changed()
+        return self._table
+
+    def reload_if_changed(self):
+        """Recompile and swap the table if its file changed; returns ``True`` if so"""
+        # Never block readers: another caller is already checking
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                stamp = self._file_stamp()
+                if stamp == self._stamp:
+                    return False
+                self._stamp = stamp
+                table = load_rule_table(self.path)
+            except (OSError, ValueError, KeyError, TypeError, re.error) as e:
+                self.last_error = e
+                return False
+
+            self._table = table
+            self.last_error = None
+            return True
+        finally:
+            self._lock.release()
+
+
+# Process-wide loader used by the agent and the module-level helpers
+default_rule_loader = RuleTableLoader()
+
+
+def get_rule_table():
+    """Active rule table of the process-wide loader"""
+    return default_rule_loader.get()
+
+
+def recurring_obligations():
+    """Specifications of the recurring fixed-date obligations, keyed by id"""
+    return get_rule_table().obligations
+
+
+def scan_triggers(text):
+    """Trigger keyword hits and day-count captures of the active rule table"""
+    return get_rule_table().scan(normalize_text(text).text)
+
+
+def match_all_tax_rules(text):
+    """Every applicable tax rule with its ``rule_id`` and character ``span``"""
+    return get_rule_table().match_all(text)
+
+
+def match_tax_rule(text):
+    """Match the first applicable Portuguese tax rule.
+
+    Returns a specification dict with a ``kind`` (``annual``, ``monthly``,
+    ``quarterly``, ``working_days`` or ``calendar_days``), its parameters, the
+    result metadata and the ``rule_id``, or ``None`` when no rule applies.
+    """
+    return get_rule_table().match(text)
+
+
+def _calendar_years(first_year, last_year, days=0):
+    """Calendar range covering the reference years plus the counted days"""
+    return first_year - 1, last_year + 5 + days // 120
+
+
+def resolve_tax_rule(spec, reference_date, subdivision=None, municipality=None):
+    """Resolve a rule specification into a deadline result for one reference date.
+
+    Fixed-date obligations falling on a weekend or holiday are rolled forward
+    to the next working day (Código Civil, art. 279.º, al. e)), keeping the
+    unadjusted date as ``original_deadline``. A ``fixed`` specification holds
+    an ISO ``date`` and resolves to it whatever the reference date.
+    """
+    ref = reference_date
+    kind = spec["kind"]
+    years = _calendar_years(ref.year, ref.year, spec.get("days", 0))
+
+    if kind == "annual":
+        deadline = datetime(ref.year, spec["month"], spec["day"])
+        if deadline < ref:
+            deadline = datetime(ref.year + 1, spec["month"], spec["day"])
+    elif kind == "monthly":
+        next_month = ref.replace(day=1) + relativedelta(months=1)
+        deadline = next_month.replace(day=spec["day"])
+    elif kind == "quarterly":
+        # If all quarters passed, use first quarter of next year
+        deadline = datetime(ref.year + 1, *QUARTER_ENDS[0])
+        for month, day in QUARTER_ENDS:
+            if datetime(ref.year, month, day) > ref:
+                deadline = datetime(ref.year, month, day)
+                break
+    elif kind == "fixed":
+        deadline = datetime.fromisoformat(spec["date"])
+        years = _calendar_years(deadline.year, deadline.year)
+    elif kind in ("working_days", "calendar_days"):
+        working_days = kind == "working_days"
+        if spec.get("suspended"):
+            judicial_calendar = get_judicial_calendar(
+                *years, working_days, "PT", subdivision, municipality
+            )
+            deadline = judicial_calendar.add_days(ref, spec["days"])
+        elif working_days:
+            business_calendar = get_business_calendar(
+                *years, "PT", subdivision, municipality
+            )
+            deadline = business_calendar.add_working_days(ref, spec["days"])
+        else:
+            deadline = ref + timedelta(days=spec["days"])
+    else:
+        raise ValueError(f"Unknown rule kind: {kind}")
+
+    result = {"deadline": deadline}
+    result.update({field: spec[field] for field in RESULT_FIELDS})
+    if spec.get("suspended"):
+        result["suspension"] = JUDICIAL_SUSPENSION
+
+    # Roll-forward stage for fixed-date obligations
+    if spec.get("roll_forward"):
+        business_calendar = get_business_calendar(
+            *years, "PT", subdivision, municipality
+        )
+        rolled = business_calendar.roll_forward(deadline)
+        if rolled != deadline:
+            result["original_deadline"] = deadline
+            result["deadline"] = rolled
+    return result
+
+
+def resolve_tax_rule_many(spec, reference_dates, subdivision=None, municipality=None):
+    """Vectorized ``resolve_tax_rule`` over an array of reference dates.
+
+    Reference dates are taken at day resolution (midnight). Returns a dict with
+    ``deadline`` and ``original_deadline`` ``datetime64[D]`` arrays; the
+    latter differs from the former only where a deadline was rolled forward.
+    """
+    refs = np.asarray(reference_dates, dtype="datetime64[D]")
+    kind = spec["kind"]
+    if refs.size == 0:
+        return {"deadline": refs.copy(), "original_deadline": refs.copy()}
+
+    ref_years = refs.astype("datetime64[Y]")
+    years = _calendar_years(
+        int(ref_years.min().astype(int)) + 1970,
+        int(ref_years.max().astype(int)) + 1970,
+        spec.get("days", 0),
+    )
+
+    if kind == "annual":
+        offset = np.timedelta64(spec["month"] - 1, "M")
+        deadline = (ref_years.astype("datetime64[M]") + offset).astype(
+            "datetime64[D]"
+        ) + np.timedelta64(spec["day"] - 1, "D")
+        next_year = ((ref_years + 1).astype("datetime64[M]") + offset).astype(
+            "datetime64[D]"
+        ) + np.timedelta64(spec["day"] - 1, "D")
+        deadline = np.where(deadline < refs, next_year, deadline)
+    elif kind == "monthly":
+        deadline = (refs.astype("datetime64[M]") + 1).astype(
+            "datetime64[D]"
+        ) + np.timedelta64(spec["day"] - 1, "D")
+    elif kind == "quarterly":
+        months = refs.astype("datetime64[M]")
+        quarter_start = months - (months.astype(int) % 3)
+        quarter_end = (quarter_start + 3).astype("datetime64[D]") - 1
+        next_quarter_end = (quarter_start + 6).astype("datetime64[D]") - 1
+        deadline = np.where(quarter_end > refs, quarter_end, next_quarter_end)
+    elif kind == "fixed":
+        deadline = np.full(refs.shape, spec["date"], dtype="datetime64[D]")
+        fixed_year = int(deadline.flat[0].astype("datetime64[Y]").astype(int)) + 1970
+        years = _calendar_years(fixed_year, fixed_year)
+    elif kind in ("working_days", "calendar_days"):
+        working_days = kind == "working_days"
+        if spec.get("suspended"):
+            judicial_calendar = get_judicial_calendar(
+                *years, working_days, "PT", subdivision, municipality
+            )
+            deadline = judicial_calendar.add_days_many(refs, spec["days"])
+        elif working_days:
+            business_calendar = get_business_calendar(
+                *years, "PT", subdivision, municipality
+            )
+            deadline = business_calendar.add_working_days_many(refs, spec["days"])
+        else:
+            deadline = refs + np.timedelta64(spec["days"], "D")
+    else:
+        raise ValueError(f"Unknown rule kind: {kind}")
+
+    original_deadline = deadline
+    if spec.get("roll_forward"):
+        business_calendar = get_business_calendar(
+            *years, "PT", subdivision, municipality
+        )
+        deadline = business_calendar.roll_forward_many(deadline)
+    return {"deadline": deadline, "original_deadline": original_deadline}
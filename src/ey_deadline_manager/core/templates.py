@@ -0,0 +1,210 @@
+"""
+EY AI Challenge - AT Document Templates
+Fingerprinting of fixed Autoridade Tributária notices and their field extractors
+"""
+
+import re
+from datetime import datetime
+
+from dateutil.relativedelta import relativedelta
+
+from .dates import MONTHS_PT, date_at
+from .normalize import normalize_text
+from .numbers import NUMBER_PATTERN, parse_number
+from .tax_rules import resolve_tax_rule
+
+# Characters of canonical text searched for the template fingerprint: the
+# address block, issue date and subject line of the first page
+FINGERPRINT_WINDOW = 1500
+
+# Every AT notice carries a subject line in its header
+SUBJECT_LABEL = "assunto:"
+
+# Header fields reported with a template result, matched on canonical text
+HEADER_FIELDS = {
+    "nif": re.compile(r"\bnif: ?(\d[\d ]*\d)"),
+    "liquidation_reference": re.compile(
+        r"referencia da liquidacao(?: reclamada)?: ?(\d+)"
+    ),
+    "tax_period": re.compile(r"periodo tributario: ?([a-z]+ ?- ?[a-z]+ \d{4})"),
+    "total_due": re.compile(r"total a pagar: ?€? ?(\d[\d.,]*)"),
+}
+
+_MONTH = "|".join(sorted(MONTHS_PT, key=len, reverse=True))
+
+_PAYMENT_MONTHS = re.compile(r"ate (\d+) mes(?:es)? apos a data de emissao")
+_COURT_DAYS = re.compile(rf"prazo de ({NUMBER_PATTERN}) dias( uteis)?")
+_REPLY_DAYS = re.compile(rf"prazo de ({NUMBER_PATTERN}) dias uteis")
+_INSPECTION_START = re.compile(
+    rf"inicio previsto para o dia (\d{{1,2}}) de ({_MONTH})\b(?: de (\d{{4}}))?"
+)
+_SUBMISSION_BY = re.compile(r"submissao[^.]*?\bate (?:ao )?(?:dia )?")
+_MISSED_LIMIT = re.compile(r"data limite de entrega (?:foi|era) (?:o dia )?")
+
+
+def _payment_notice(canonical, reference):
+    """Nota de cobrança: voluntary payment within N months of the issue date"""
+    match = _PAYMENT_MONTHS.search(canonical)
+    if match is None:
+        return None
+    months = int(match.group(1))
+    deadline = reference + relativedelta(months=months)
+    return {
+        "kind": "fixed",
+        "date": deadline.date().isoformat(),
+        "roll_forward": True,
+        "rule": f"Voluntary payment within {months} months of issue",
+        "priority": "high",
+        "legal_basis": "CPPT - Pagamento voluntário",
+        "confidence": "high",
+    }
+
+
+def _dismissal(canonical, reference):
+    """Despacho de indeferimento: court challenge within N days of notification"""
+    match = _COURT_DAYS.search(canonical)
+    if match is None:
+        return None
+    days = parse_number(match.group(1))
+    working_days = match.group(2) is not None
+    unit = "working days" if working_days else "days"
+    return {
+        "kind": "working_days" if working_days else "calendar_days",
+        "days": days,
+        # Judicial challenge: counting stops during judicial holidays, and a
+        # term ending on a closed day moves to the next working day
+        "suspended": True,
+        "roll_forward": True,
+        "rule": f"{days} {unit} to challenge the dismissal",
+        "priority": "urgent",
+        "legal_basis": "CPPT - Impugnação judicial",
+        "confidence": "high",
+    }
+
+
+def _inspection(canonical, reference):
+    """Notificação de início de inspeção: the announced start date"""
+    match = _INSPECTION_START.search(canonical)
+    if match is None:
+        return None
+    day, month = int(match.group(1)), MONTHS_PT[match.group(2)]
+    try:
+        if match.group(3):
+            start = datetime(int(match.group(3)), month, day)
+        else:
+            # Year left out: the next such date on or after the notice
+            start = datetime(reference.year, month, day)
+            if start < reference.replace(hour=0, minute=0, second=0, microsecond=0):
+                start = datetime(reference.year + 1, month, day)
+    except ValueError:
+        return None
+    return {
+        "kind": "fixed",
+        "date": start.date().isoformat(),
+        "rule": "Start of external tax inspection",
+        "priority": "high",
+        "legal_basis": "LGT, art. 49.º - Procedimento de inspeção",
+        "confidence": "high",
+    }
+
+
+def _missing_declaration(canonical, reference):
+    """Aviso de obrigação declarativa em falta: the new or the missed deadline"""
+    submission = _SUBMISSION_BY.search(canonical)
+    deadline = submission and date_at(canonical, submission.end())
+    if deadline:
+        rule = "Submit the missing declaration"
+    else:
+        missed = _MISSED_LIMIT.search(canonical)
+        deadline = missed and date_at(canonical, missed.end())
+        if not deadline:
+            return None
+        rule = "Missing declaration overdue - submit as soon as possible"
+    return {
+        "kind": "fixed",
+        "date": deadline.date().isoformat(),
+        "rule": rule,
+        "priority": "urgent",
+        "legal_basis": "RGIT - Falta de entrega de declaração",
+        "confidence": "high",
+    }
+
+
+def _vat_divergence(canonical, reference):
+    """Notificação por divergência de IVA: reply within N working days"""
+    match = _REPLY_DAYS.search(canonical)
+    if match is None:
+        return None
+    days = parse_number(match.group(1))
+    return {
+        "kind": "working_days",
+        "days": days,
+        "suspended": False,
+        "rule": f"{days} working days to respond to the VAT divergence",
+        "priority": "urgent",
+        "legal_basis": "CPPT - Direito de audição",
+        "confidence": "high",
+    }
+
+
+# (template id, phrases that must all appear in the first-page header,
+# field extractor), checked in order
+AT_TEMPLATES = (
+    ("nota_cobranca", ("nota de cobranca", "pagamento voluntario"), _payment_notice),
+    ("despacho_indeferimento", ("despacho de indeferimento",), _dismissal),
+    ("inicio_inspecao", ("notificacao de inicio", "inspecao tributaria"), _inspection),
+    ("obrigacao_em_falta", ("obrigacao declarativa em falta",), _missing_declaration),
+    ("divergencia_iva", ("notificacao por divergencia",), _vat_divergence),
+)
+
+
+def fingerprint_template(text):
+    """Id of the AT template ``text`` was produced from, or ``None``.
+
+    Only the header of the canonical text is inspected, so recognising a
+    template costs a few substring checks whatever the document length.
+    """
+    head = normalize_text(text).text[:FINGERPRINT_WINDOW]
+    if SUBJECT_LABEL not in head:
+        return None
+    for template_id, phrases, _ in AT_TEMPLATES:
+        if all(phrase in head for phrase in phrases):
+            return template_id
+    return None
+
+
+def header_fields(text):
+    """NIF, liquidation reference, tax period and amount due found in ``text``"""
+    normalized = normalize_text(text)
+    fields = {}
+    for name, pattern in HEADER_FIELDS.items():
+        match = pattern.search(normalized.text)
+        if match:
+            start, end = normalized.original_span(*match.span(1))
+            fields[name] = " ".join(normalized.original[start:end].split())
+    return fields
+
+
+def extract_template_deadline(
+    text, reference_date, subdivision=None, municipality=None
+):
+    """Deadline of a recognised AT notice, from its dedicated extractor.
+
+    ``reference_date`` should be the notice's issue date when known. Returns
+    a rule-style result with the ``template`` id and its header ``fields``,
+    or ``None`` when the text is no known template or its extractor cannot
+    find the expected wording (the generic chain then takes over).
+    """
+    template_id = fingerprint_template(text)
+    if template_id is None:
+        return None
+    extractor = next(
+        extractor for tid, _, extractor in AT_TEMPLATES if tid == template_id
+    )
+    spec = extractor(normalize_text(text).text, reference_date)
+    if spec is None:
+        return None
+    result = resolve_tax_rule(spec, reference_date, subdivision, municipality)
+    result["template"] = template_id
+    result["fields"] = header_fields(text)
+    return result
@@ -0,0 +1,38 @@
+"""
+EY AI Challenge - Deadline Urgency Classification
+Working-days-remaining figures and URGENT/IMPORTANT/NORMAL labels in bulk
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from .business_days import count_working_days_many
+
+# One working week and roughly one working month
+URGENT_WORKING_DAYS = 5
+IMPORTANT_WORKING_DAYS = 22
+
+URGENCY_LEVELS = ("URGENT", "IMPORTANT", "NORMAL")
+URGENCY_ICONS = {"URGENT": "🔴", "IMPORTANT": "🟡", "NORMAL": "🟢"}
+
+
+def classify_urgency_many(deadlines, today=None):
+    """Classify many deadlines in a single vectorized call.
+
+    Returns a tuple ``(working_days_left, labels)`` of numpy arrays, where
+    ``working_days_left`` counts Portuguese working days from ``today``
+    (exclusive) to each deadline (inclusive) and is negative once overdue.
+    """
+    today = today or datetime.now()
+    working_days_left = count_working_days_many(today, deadlines)
+    level = np.searchsorted(
+        [URGENT_WORKING_DAYS, IMPORTANT_WORKING_DAYS], working_days_left, side="left"
+    )
+    return working_days_left, np.asarray(URGENCY_LEVELS)[level]
+
+
+def classify_urgency(deadline, today=None):
+    """Classify a single deadline, returning ``(working_days_left, label)``"""
+    working_days_left, labels = classify_urgency_many([deadline], today)
+    return int(working_days_left[0]), str(labels[0])
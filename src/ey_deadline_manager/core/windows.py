@@ -0,0 +1,171 @@
+"""
+EY AI Challenge - Trigger Windows
+Sentence segmentation and trigger-word windows for very large documents
+"""
+
+import re
+import sys
+from bisect import bisect_right
+
+from .normalize import SizedCache, normalize_text
+from .tax_rules import _whole_word, get_rule_table
+
+# Documents up to this many canonical characters are processed whole
+WINDOW_THRESHOLD = 20_000
+# Sentences kept on each side of the sentence holding a trigger
+CONTEXT_SENTENCES = 1
+# Longest reach of a window around its trigger, for text without sentence
+# punctuation (tables, OCR output); covers a rule's ``PREFIX_WINDOW``
+WINDOW_RADIUS = 600
+# Memory budget of the excerpts kept for reuse, counting each document's
+# original text and the joined windows
+EXCERPT_CACHE_BYTES = 32 * 2**20
+# Put between windows so that no word or date spans two of them
+WINDOW_SEPARATOR = "\n[...]\n"
+# Windows covering more than this share of a document are not worth cutting
+# out; the document is kept whole instead
+MAX_WINDOW_SHARE = 0.5
+
+# Words around which deadlines are stated, besides the rule table keywords
+DEADLINE_WORDS = re.compile(r"\b(?:prazo|dias?|ate|notifica\w*)\b")
+
+_SENTENCE_END = re.compile(r"[.!?;](?=\s)")
+
+
+def sentence_spans(canonical):
+    """``(start, end)`` of every sentence of canonical text, in order"""
+    spans = []
+    start = 0
+    for end in _SENTENCE_END.finditer(canonical):
+        spans.append((start, end.end()))
+        start = end.end() + 1
+    if start < len(canonical):
+        spans.append((start, len(canonical)))
+    return spans
+
+
+def _trigger_spans(canonical, table):
+    for match in DEADLINE_WORDS.finditer(canonical):
+        yield match.span()
+    for start, keyword in table.automaton.finditer(canonical):
+        if _whole_word(canonical, start, start + len(keyword)):
+            yield start, start + len(keyword)
+
+
+def trigger_windows(canonical, table=None):
+    """Merged ``(start, end)`` windows of canonical text around every trigger.
+
+    Triggers are the deadline words of ``DEADLINE_WORDS`` and the keywords
+    of the rule ``table`` (by default the active one) occurring as whole
+    words, so "iva" does not fire inside "relativamente". A window is the
+    trigger's sentence with ``CONTEXT_SENTENCES`` on each side, clipped to
+    ``WINDOW_RADIUS`` characters around the trigger.
+    """
+    table = table or get_rule_table()
+    sentences = sentence_spans(canonical)
+    starts = [start for start, _ in sentences]
+    windows = []
+    for start, end in _trigger_spans(canonical, table):
+        index = bisect_right(starts, start) - 1
+        first = sentences[max(index - CONTEXT_SENTENCES, 0)][0]
+        last = sentences[min(index + CONTEXT_SENTENCES, len(sentences) - 1)][1]
+        windows.append(
+            (max(first, start - WINDOW_RADIUS), min(last, end + WINDOW_RADIUS))
+        )
+
+    merged = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class DocumentExcerpt:
+    """The parts of a document worth reading, with offsets back into it.
+
+    ``text`` joins the original text of each window in ``spans`` with
+    ``WINDOW_SEPARATOR``; when the whole document is kept it is the original
+    string itself, so content hashes and memo keys do not change.
+    """
+
+    __slots__ = ("_starts", "original", "spans", "text")
+
+    def __init__(self, original, spans):
+        self.original = original
+        self.spans = spans
+        if spans == [(0, len(original))]:
+            self.text = original
+            self._starts = [0]
+            return
+        pieces = [original[start:end] for start, end in spans]
+        self.text = WINDOW_SEPARATOR.join(pieces)
+        self._starts = []
+        offset = 0
+        for piece in pieces:
+            self._starts.append(offset)
+            offset += len(piece) + len(WINDOW_SEPARATOR)
+
+    @property
+    def windowed(self):
+        """Whether parts of the document were left out"""
+        return self.text is not self.original
+
+    def _original_offset(self, position):
+        index = max(bisect_right(self._starts, position) - 1, 0)
+        start, end = self.spans[index]
+        return min(start + position - self._starts[index], end)
+
+    def original_span(self, start, end):
+        """Span in the original text covering excerpt ``text[start:end]``"""
+        if start >= end:
+            offset = self._original_offset(start)
+            return offset, offset
+        return self._original_offset(start), self._original_offset(end - 1) + 1
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by this object, the original text included"""
+        size = sys.getsizeof(self.original) + 16 * len(self.spans)
+        return size + sys.getsizeof(self.text) if self.windowed else size
+
+    def __len__(self):
+        return len(self.text)
+
+    def __repr__(self):
+        return (
+            f"DocumentExcerpt({len(self.spans)} windows, "
+            f"{len(self.text)}/{len(self.original)} chars)"
+        )
+
+
+_excerpt_cache = SizedCache(EXCERPT_CACHE_BYTES, lambda value: value.nbytes)
+
+
+def _excerpt(text, table):
+    normalized = normalize_text(text)
+    if len(normalized) <= WINDOW_THRESHOLD:
+        return DocumentExcerpt(text, [(0, len(text))])
+    # Nothing that looks like a deadline: keep the head, where notices
+    # state their subject
+    windows = trigger_windows(normalized.text, table) or [(0, WINDOW_THRESHOLD)]
+    if sum(end - start for start, end in windows) > MAX_WINDOW_SHARE * len(normalized):
+        return DocumentExcerpt(text, [(0, len(text))])
+    return DocumentExcerpt(
+        text, [normalized.original_span(start, end) for start, end in windows]
+    )
+
+
+def document_excerpt(text):
+    """``DocumentExcerpt`` of the trigger windows of ``text``.
+
+    Documents of up to ``WINDOW_THRESHOLD`` canonical characters are kept
+    whole; longer ones are cut down to their trigger windows, so rules, date
+    parsing and the AI prompt scale with the relevant content rather than
+    the page count. When the windows cover more than ``MAX_WINDOW_SHARE`` of
+    the document it is kept whole too. Cached per content and rule table, up
+    to ``EXCERPT_CACHE_BYTES``.
+    """
+    table = get_rule_table()
+    return _excerpt_cache.get((text, table), lambda: _excerpt(text, table))
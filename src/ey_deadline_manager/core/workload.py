@@ -0,0 +1,94 @@
+"""
+EY AI Challenge - Deadline Workload Aggregation
+Per-day, per-week and per-obligation deadline load counts with array bincounts
+"""
+
+import numpy as np
+import pandas as pd
+
+WEEKDAY_LABELS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+# datetime64[D] day 0 (1970-01-01) was a Thursday
+_EPOCH_WEEKDAY = 3
+
+
+def _week_start(days):
+    """Monday of the week of each ``datetime64[D]`` day"""
+    return days - (days.astype(np.int64) + _EPOCH_WEEKDAY) % 7
+
+
+def workload_counts(deadlines, start=None, end=None, obligations=None):
+    """Aggregate deadlines into daily, weekly and per-obligation load counts.
+
+    ``deadlines`` is anything ``numpy`` can turn into ``datetime64[D]``;
+    ``NaT`` entries and deadlines outside ``start``..``end`` (which default to
+    the earliest and latest deadline) are ignored. ``obligations`` optionally
+    labels each deadline (strings or a ``Categorical``); unlabelled
+    deadlines (``None``/``NaN``) count towards the daily and weekly load but
+    not towards any obligation.
+
+    Every count is a single ``np.bincount`` over day offsets, so a year of
+    portfolio deadlines aggregates in milliseconds. Returns a dict with
+    ``days``/``per_day``, ``weeks``/``per_week`` (weeks start on Monday) and,
+    when labels are given, ``obligation_labels``, ``per_obligation`` totals and
+    ``per_obligation_day`` shaped ``(n_labels, n_days)``.
+    """
+    deadlines = np.asarray(deadlines, dtype="datetime64[D]").ravel()
+    valid = ~np.isnat(deadlines)
+    if obligations is not None:
+        codes, labels = pd.factorize(pd.array(obligations))
+        codes = codes[valid]
+    deadlines = deadlines[valid]
+
+    if start is None:
+        start = deadlines.min() if deadlines.size else np.datetime64("today", "D")
+    if end is None:
+        end = deadlines.max() if deadlines.size else start
+    start = np.datetime64(start, "D")
+    end = np.datetime64(end, "D")
+
+    n_days = int((end - start).astype(np.int64)) + 1
+    offsets = (deadlines - start).astype(np.int64)
+    in_range = (offsets >= 0) & (offsets < n_days)
+    offsets = offsets[in_range]
+    days = start + np.arange(n_days)
+
+    first_week = _week_start(start)
+    week_offsets = (offsets + (start - first_week).astype(np.int64)) // 7
+    n_weeks = int((_week_start(end) - first_week).astype(np.int64)) // 7 + 1
+
+    counts = {
+        "days": days,
+        "per_day": np.bincount(offsets, minlength=n_days),
+        "weeks": first_week + 7 * np.arange(n_weeks),
+        "per_week": np.bincount(week_offsets, minlength=n_weeks),
+    }
+    if obligations is not None:
+        codes = codes[in_range]
+        # ``factorize`` codes missing labels as -1
+        labelled = codes >= 0
+        codes, label_offsets = codes[labelled], offsets[labelled]
+        n_labels = len(labels)
+        counts["obligation_labels"] = list(labels)
+        counts["per_obligation"] = np.bincount(codes, minlength=n_labels)
+        counts["per_obligation_day"] = np.bincount(
+            codes * n_days + label_offsets, minlength=n_labels * n_days
+        ).reshape(n_labels, n_days)
+    return counts
+
+
+def workload_heatmap(deadlines, start, end):
+    """Calendar heatmap grid of deadline counts: weekdays x weeks.
+
+    Returns ``(grid, weeks)`` where ``grid`` has shape ``(7, n_weeks)`` with
+    rows Monday..Sunday, and ``weeks`` holds the Monday of each column. Days
+    outside ``start``..``end`` are zero.
+    """
+    counts = workload_counts(deadlines, start, end)
+    start = np.datetime64(start, "D")
+    lead = int((start - counts["weeks"][0]).astype(np.int64))
+
+    n_weeks = counts["weeks"].size
+    grid = np.zeros(7 * n_weeks, dtype=np.int64)
+    grid[lead : lead + counts["per_day"].size] = counts["per_day"]
+    return grid.reshape(n_weeks, 7).T, counts["weeks"]
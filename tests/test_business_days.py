@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the precomputed business day calendar
+"""
+
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import holidays
+import numpy as np
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.business_days import (
+    BusinessDayCalendar,
+    add_working_days_many,
+    count_working_days,
+    count_working_days_many,
+    roll_forward_many,
+)
+
+PT_HOLIDAYS = holidays.Portugal()
+
+
+def walk_working_days(start_date, num_days):
+    """Reference implementation: step one calendar day at a time"""
+    current_date = start_date
+    days_added = 0
+    while days_added < num_days:
+        current_date += timedelta(days=1)
+        if current_date.weekday() < 5 and current_date not in PT_HOLIDAYS:
+            days_added += 1
+    return current_date
+
+
+def test_add_working_days_matches_walk():
+    """Bisect lookup agrees with the day-by-day walk"""
+    calendar = BusinessDayCalendar(2024, 2027)
+    start = date(2024, 1, 1)
+    for offset in range(0, 900, 7):
+        day = start + timedelta(days=offset)
+        for num_days in (0, 1, 5, 15, 30):
+            assert calendar.add_working_days(day, num_days) == walk_working_days(
+                day, num_days
+            )
+
+
+def test_add_working_days_preserves_time():
+    """Datetimes keep their time of day"""
+    calendar = BusinessDayCalendar(2025, 2025)
+    start = datetime(2025, 5, 29, 14, 30)  # Thursday
+    result = calendar.add_working_days(start, 2)
+    assert result == datetime(2025, 6, 2, 14, 30)  # Monday
+
+
+def test_is_working_day():
+    """Weekends and holidays are not working days"""
+    calendar = BusinessDayCalendar(2025, 2025)
+    assert calendar.is_working_day(date(2025, 6, 2))
+    assert not calendar.is_working_day(date(2025, 6, 1))  # Sunday
+    assert not calendar.is_working_day(date(2025, 6, 10))  # Dia de Portugal
+
+
+def test_out_of_range_raises():
+    """Lookups outside the precomputed years are rejected"""
+    calendar = BusinessDayCalendar(2025, 2025)
+    with pytest.raises(ValueError):
+        calendar.add_working_days(date(2024, 12, 1), 5)
+    with pytest.raises(ValueError):
+        calendar.add_working_days(date(2025, 12, 20), 30)
+
+
+def test_add_working_days_many_matches_scalar():
+    """Vectorized offsets agree with the scalar walk, including weekend starts"""
+    starts = [date(2024, 12, 20) + timedelta(days=i) for i in range(40)]
+    offsets = [(i % 4) * 10 for i in range(40)]
+    result = add_working_days_many(starts, offsets)
+    expected = [walk_working_days(d, n) for d, n in zip(starts, offsets, strict=True)]
+    assert [d.astype(date) for d in result] == expected
+
+
+def test_add_working_days_many_bulk():
+    """A million pairs are processed in one call"""
+    starts = np.datetime64("2025-01-01") + np.arange(1_000_000) % 365
+    offsets = np.arange(1_000_000) % 31
+    result = add_working_days_many(starts, offsets)
+    assert result.shape == (1_000_000,)
+    assert result[30].astype(date) == walk_working_days(date(2025, 1, 31), 30)
+
+
+def test_count_working_days_inverts_add():
+    """Counting working days undoes adding them, scalar and vectorized"""
+    calendar = BusinessDayCalendar(2025, 2026)
+    start = date(2025, 12, 19)
+    ends = [walk_working_days(start, n) for n in range(40)]
+    for num_days, end in enumerate(ends):
+        assert calendar.count_working_days(start, end) == num_days
+        assert count_working_days(start, end) == num_days
+    assert count_working_days_many(start, ends).tolist() == list(range(40))
+
+
+def test_count_working_days_overdue_is_negative():
+    """Deadlines in the past yield negative counts"""
+    calendar = BusinessDayCalendar(2025, 2025)
+    assert calendar.count_working_days(date(2025, 6, 6), date(2025, 6, 2)) == -4
+    assert count_working_days(date(2025, 6, 6), date(2025, 6, 2)) == -4
+
+
+def test_roll_forward_scalar_and_bulk():
+    """Weekend and holiday dates move to the next working day"""
+    calendar = BusinessDayCalendar(2025, 2025)
+    days = [date(2025, 5, 25), date(2025, 6, 10), date(2025, 6, 11)]
+    expected = [date(2025, 5, 26), date(2025, 6, 11), date(2025, 6, 11)]
+    assert [calendar.roll_forward(day) for day in days] == expected
+    assert [d.astype(date) for d in roll_forward_many(days)] == expected
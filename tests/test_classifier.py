@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline obligation classifier
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core import classifier, deadline_agent_backend
+from ey_deadline_manager.core.classifier import (
+    N_FEATURES,
+    ObligationClassifier,
+    hashed_features,
+    load_classifier,
+    route_document,
+)
+from ey_deadline_manager.core.deadline_agent_backend import DeadlineManagerAgent
+from ey_deadline_manager.core.memo import RuleMemo
+
+REFERENCE = datetime(2025, 4, 10)
+
+
+class CountingGemini:
+    """Stands in for the Gemini client, counting calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        return type("Response", (), {"text": '{"error": "No deadline found"}'})()
+
+
+def test_hashed_features():
+    """Features are stable, unit length and insensitive to case and accents"""
+    features = hashed_features("Declaração periódica de IVA")
+    assert features.shape == (N_FEATURES,)
+    assert np.isclose(np.linalg.norm(features), 1)
+    assert np.array_equal(features, hashed_features("DECLARACAO periodica de iva"))
+    assert not hashed_features("").any()
+
+
+def test_train_save_and_load(tmp_path):
+    """A trained model survives a round trip through its archive"""
+    model = ObligationClassifier.train(
+        ["entregar a IES", "submeter a IES", "reunião de equipa", "almoço de equipa"],
+        ["ies", "ies", "none", "none"],
+        [True, True, False, False],
+    )
+    assert model.predict("enviar a IES")["obligation"] == "ies"
+    assert model.predict("reunião de equipa")["has_deadline"] < 0.5
+
+    loaded = ObligationClassifier.load(model.save(tmp_path / "model.npz"))
+    assert loaded.labels == model.labels
+    assert loaded.predict("enviar a IES") == model.predict("enviar a IES")
+    assert load_classifier(tmp_path / "missing.npz") is None
+
+
+def test_shipped_classifier_routes():
+    """The shipped model skips, resolves or forwards documents"""
+    assert route_document("Obrigado pela reunião de ontem")[0] == "no_deadline"
+    route, prediction = route_document("Submeter ficheiro SAF-T da empresa XPTO")
+    assert (route, prediction["obligation"]) == ("obligation", "saf_t")
+    route, prediction = route_document(
+        "Pedido de esclarecimentos com resposta em vinte dias"
+    )
+    assert (route, prediction["obligation"]) == ("ai", "notice")
+
+
+def test_routing_without_classifier(monkeypatch):
+    """Without a shipped model every document goes to the AI"""
+    monkeypatch.setattr(classifier, "CLASSIFIER", None)
+    assert route_document("Obrigado pela reunião de ontem") == ("ai", None)
+
+
+def test_pipeline_skips_the_ai(monkeypatch):
+    """Deadline-free and obvious documents never reach Gemini"""
+    monkeypatch.setattr(
+        deadline_agent_backend, "default_spec_memo", RuleMemo(registry=None)
+    )
+    agent = DeadlineManagerAgent()
+    agent.genai_model = CountingGemini()
+
+    result = agent.process_document("Obrigado pela reunião de ontem", REFERENCE)
+    assert result["processing_method"] == "failed"
+    assert result["classification"]["obligation"] == "none"
+
+    result = agent.process_document(
+        "Enviar a Informação Empresarial Simplificada da Sonae", REFERENCE
+    )
+    assert result["processing_method"] == "classifier"
+    assert result["rule_id"] == "ies"
+    assert result["deadline"] == datetime(2025, 4, 15)
+    assert agent.genai_model.calls == 0
+
+    agent.process_document(
+        "Pedido de esclarecimentos com resposta em vinte dias", REFERENCE
+    )
+    assert agent.genai_model.calls == 1
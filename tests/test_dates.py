@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the explicit date-literal extractor
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.dates import (
+    find_explicit_deadline,
+    find_notification_date,
+    iter_explicit_dates,
+)
+from ey_deadline_manager.core.deadline_agent_backend import DeadlineManagerAgent
+
+REFERENCE = datetime(2025, 5, 29)
+
+CASES = [
+    ("Modelo 22 - IRS deve ser entregue até 31 de julho de 2025", "2025-07-31"),
+    ("Prazo até 15 de Setembro de 2025 para IES", "2025-09-15"),
+    ("Deadline: 31/12/2025", "2025-12-31"),
+    ("Data limite: 2025-06-30", "2025-06-30"),
+    ("Entrega em 15-08-2025", "2025-08-15"),
+    ("Vencimento em dezembro de 2025", "2025-12-31"),
+    ("Prazo dezembro 2025", "2025-12-31"),
+    ("Pagamento até 3 de fev. de 2026", "2026-02-03"),
+    ("No deadline in this text", None),
+]
+
+
+def test_explicit_date_formats():
+    """Every supported format is recognised"""
+    for text, expected in CASES:
+        result = find_explicit_deadline(text, REFERENCE)
+        if expected is None:
+            assert result is None, text
+        else:
+            assert result["deadline"].strftime("%Y-%m-%d") == expected, text
+
+
+def test_dates_in_document_order_with_spans():
+    """Dates come back in order, with spans covering the literal"""
+    text = "Notificação de 12/05/2025. Pagar até 30 de junho de 2025."
+    dates = list(iter_explicit_dates(text))
+    assert [date for date, _ in dates] == [datetime(2025, 5, 12), datetime(2025, 6, 30)]
+    assert text[slice(*dates[0][1])] == "12/05/2025"
+    assert text[slice(*dates[1][1])] == "30 de junho de 2025"
+
+
+def test_past_and_impossible_dates_are_skipped():
+    """Dates before the reference and invalid dates are not deadlines"""
+    text = "Emitido em 2025-05-01, prazo 31/02/2026, limite 15/07/2025"
+    assert find_explicit_deadline(text, REFERENCE)["deadline"] == datetime(2025, 7, 15)
+    assert find_explicit_deadline("Emitido em 2025-05-01", REFERENCE) is None
+
+
+def test_process_document_uses_dates_before_ai():
+    """Explicit dates are found without an AI call when no rule applies"""
+    agent = DeadlineManagerAgent()
+    result = agent.process_document(
+        "Entregar o relatório até 15 de julho de 2025", REFERENCE
+    )
+    assert result["processing_method"] == "date_extraction"
+    assert result["deadline"] == datetime(2025, 7, 15)
+
+
+def test_notification_date_from_header():
+    """Header labels give the notice date; deadlines and months do not"""
+    assert find_notification_date("DATA DE EMISSÃO:  27-05-2025") == datetime(
+        2025, 5, 27
+    )
+    assert find_notification_date("DATA DE EMISSÃO: 10 de Maio de 2025") == (
+        datetime(2025, 5, 10)
+    )
+    assert find_notification_date("Texto\n\nData: 2025-04-15\n") == datetime(
+        2025, 4, 15
+    )
+    assert find_notification_date("Data limite de entrega: 20 de maio de 2025") is None
+    assert find_notification_date("Data: maio 2025") is None
+
+
+def test_process_document_counts_from_notice_date():
+    """Working days run from the notice's own date, not the agent's"""
+    agent = DeadlineManagerAgent()
+    text = (
+        "NOTIFICAÇÃO DE REJEIÇÃO\n"
+        "Deve proceder à correção no prazo de 15 dias úteis.\n"
+        "Data: 2025-04-15"
+    )
+    result = agent.process_document(text, REFERENCE)
+    assert result["reference_source"] == "document"
+    assert result["reference_date"] == datetime(2025, 4, 15)
+    assert (
+        result["deadline"]
+        == agent.process_document(text, datetime(2025, 4, 15), use_document_date=False)[
+            "deadline"
+        ]
+    )
+    ignored = agent.process_document(text, REFERENCE, use_document_date=False)
+    assert ignored["reference_source"] == "given"
+    assert ignored["deadline"] > result["deadline"]
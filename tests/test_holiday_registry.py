@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the process-wide holiday calendar registry
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.deadline_agent_backend import DeadlineManagerAgent
+from ey_deadline_manager.core.holiday_registry import HolidayCalendarRegistry
+
+
+def test_holiday_calendar_is_memoized_and_expanded():
+    """The same calendar is returned with requested years pre-expanded"""
+    registry = HolidayCalendarRegistry()
+    first = registry.get_holiday_calendar("PT", range(2025, 2027))
+    second = registry.get_holiday_calendar("PT", [2030])
+    assert first is second
+    assert {2025, 2026, 2030} <= first.years
+    assert date(2030, 12, 25) in first
+
+
+def test_business_calendar_shared_across_threads():
+    """Concurrent lookups compile a year range exactly once"""
+    registry = HolidayCalendarRegistry()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        calendars = list(
+            pool.map(lambda _: registry.get_business_calendar(2024, 2026), range(32))
+        )
+    assert all(calendar is calendars[0] for calendar in calendars)
+
+
+def test_agents_share_calendars():
+    """Agents built back to back reuse the same calendar objects"""
+    first = DeadlineManagerAgent()
+    second = DeadlineManagerAgent()
+    assert first.portuguese_holidays is second.portuguese_holidays
+    assert first.business_calendar is second.business_calendar
+
+
+def test_regional_and_municipal_calendars():
+    """Regional and municipal holidays are layered on the national calendar"""
+    registry = HolidayCalendarRegistry()
+    madeira = registry.get_holiday_calendar("PT", [2025], subdivision="Madeira")
+    lisboa = registry.get_holiday_calendar("PT", [2025], municipality="Lisboa")
+    funchal_like = registry.get_holiday_calendar(
+        "PT", [2025], subdivision="30", municipality="Porto"
+    )
+    assert date(2025, 7, 1) in madeira
+    assert date(2025, 6, 13) in lisboa
+    assert date(2025, 6, 13) not in madeira
+    assert date(2025, 7, 1) in funchal_like
+    assert date(2025, 6, 24) in funchal_like
+
+
+def test_location_keys_are_canonical():
+    """Aliases and codes resolve to the same compiled calendar"""
+    registry = HolidayCalendarRegistry()
+    by_alias = registry.get_business_calendar(2025, 2025, subdivision="Açores")
+    by_code = registry.get_business_calendar(2025, 2025, subdivision="20")
+    assert by_alias is by_code
+    assert not by_code.is_working_day(date(2025, 6, 9))
+
+
+def test_agent_uses_municipal_calendar():
+    """Working-day deadlines skip the municipal holiday when asked to"""
+    agent = DeadlineManagerAgent()
+    start = date(2025, 6, 11)  # Wednesday
+    assert agent.add_working_days(start, 2) == date(2025, 6, 13)
+    assert agent.add_working_days(start, 2, municipality="Lisboa") == date(2025, 6, 16)
+
+
+def test_agent_counts_outside_its_calendar_years():
+    """Counts beyond the agent's calendar years use a shared calendar"""
+    agent = DeadlineManagerAgent()
+    first_year, last_year = agent.calendar_years
+    start = date(last_year, 12, 1)
+    calendar = agent._calendar_for(start, 30)
+    assert calendar is not agent.business_calendar
+    assert calendar.end_year > last_year
+    assert agent.add_working_days(start, 30) == calendar.add_working_days(start, 30)
+    # Before the agent's years too: Christmas 2010 was a Saturday
+    assert agent.add_working_days(date(2010, 12, 20), 5) == date(2010, 12, 27)
+    assert agent._calendar_for(date(first_year + 1, 6, 1), 30) is (
+        agent.business_calendar
+    )
+
+
+def test_readers_wait_for_a_year_being_expanded(monkeypatch):
+    """A year listed in ``years`` but still being populated is not served"""
+    registry = HolidayCalendarRegistry()
+    holiday_calendar = registry.get_holiday_calendar("PT", [2025])
+    populating = threading.Event()
+    populate = holiday_calendar._populate
+
+    def slow_populate(year):
+        populating.set()
+        time.sleep(0.2)
+        populate(year)
+
+    monkeypatch.setattr(holiday_calendar, "_populate", slow_populate)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        writer = pool.submit(registry.get_holiday_calendar, "PT", [2032])
+        populating.wait()
+        # 2032 is already in ``years`` here, but not yet populated
+        reader = registry.get_holiday_calendar("PT", [2032])
+        assert date(2032, 12, 25) in reader
+        assert writer.result() is reader
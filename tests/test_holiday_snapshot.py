@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled per-year holiday snapshot
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import holidays
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.business_days import BusinessDayCalendar
+from ey_deadline_manager.core.holiday_registry import is_working_day
+from ey_deadline_manager.core.holiday_snapshot import (
+    SNAPSHOT,
+    HolidaySnapshot,
+    build_snapshot,
+)
+
+
+def test_shipped_snapshot_matches_holidays_package():
+    """Every bit of the shipped snapshot agrees with holidays.Portugal()"""
+    assert SNAPSHOT is not None
+    pt_holidays = holidays.Portugal()
+    day = date(SNAPSHOT.first_year, 1, 1)
+    while day.year <= min(SNAPSHOT.last_year, SNAPSHOT.first_year + 30):
+        expected = day.weekday() < 5 and day not in pt_holidays
+        assert SNAPSHOT.is_working_day(day) == expected, day
+        day += timedelta(days=1)
+
+
+def test_build_and_load_round_trip(tmp_path):
+    """A freshly built snapshot is memory-mapped back with the same answers"""
+    path = build_snapshot(tmp_path / "holidays.bin", 2024, 2025)
+    snapshot = HolidaySnapshot(path)
+    assert snapshot.covers(2024, 2025)
+    assert not snapshot.covers(2026)
+    assert not snapshot.is_working_day(date(2024, 12, 25))
+    assert snapshot.is_working_day(date(2024, 12, 27))
+
+
+def test_calendar_built_from_snapshot_matches_holidays():
+    """The snapshot-backed index equals the one built from holidays.Portugal()"""
+    from_snapshot = BusinessDayCalendar(2024, 2026)
+    from_holidays = BusinessDayCalendar(2024, 2026, holidays.Portugal())
+    assert from_snapshot.holiday_calendar is None
+    assert from_snapshot.working_ordinals == from_holidays.working_ordinals
+
+
+def test_is_working_day_falls_back_outside_snapshot():
+    """Years outside the snapshot are answered by holidays.Portugal()"""
+    assert not is_working_day(date(SNAPSHOT.last_year + 1, 12, 25))
+    assert is_working_day(date(2025, 6, 13))
+    assert not is_working_day(date(2025, 6, 13), municipality="Lisboa")
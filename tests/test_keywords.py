@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass keyword automaton
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.keywords import KeywordAutomaton
+from ey_deadline_manager.core.tax_rules import match_tax_rule, scan_triggers
+
+
+def test_overlapping_keywords_are_all_found():
+    """Keywords inside or overlapping longer ones are still hits"""
+    automaton = KeywordAutomaton(["declaracao", "declaracao mensal", "mensal", "ensa"])
+    assert automaton.scan("a declaracao mensal") == {
+        "declaracao",
+        "declaracao mensal",
+        "mensal",
+        "ensa",
+    }
+    assert automaton.scan("nada aqui") == set()
+
+
+def test_finditer_reports_longest_keyword_per_position():
+    """Each position yields the longest keyword starting there"""
+    automaton = KeywordAutomaton(["modelo", "modelo 22", "iva"])
+    assert list(automaton.finditer("modelo 22 e iva")) == [
+        (0, "modelo 22"),
+        (12, "iva"),
+    ]
+
+
+def test_scan_triggers_takes_leftmost_day_counts():
+    """Day-count patterns report their leftmost match like re.search"""
+    hits, captures = scan_triggers(
+        "prazo de 10 dias; resposta em 5 dias úteis ou 8 dias úteis"
+    )
+    assert captures == {"calendar_days": "10", "working_days": "5"}
+    assert "prazo" in hits
+
+
+def test_rule_precedence_is_unchanged():
+    """Working days still win over calendar days, and obligations over both"""
+    assert match_tax_rule("prazo de 10 dias ou 5 dias úteis")["days"] == 5
+    assert match_tax_rule("SAF-T: prazo de 10 dias")["rule"] == "SAF-T monthly deadline"
+    assert match_tax_rule("Recurso, prazo de 30 dias")["suspended"] is True
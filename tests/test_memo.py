@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the rule evaluation memo
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core import deadline_agent_backend, tax_rules
+from ey_deadline_manager.core.deadline_agent_backend import DeadlineManagerAgent
+from ey_deadline_manager.core.holiday_registry import HolidayCalendarRegistry
+from ey_deadline_manager.core.memo import RuleMemo
+from ey_deadline_manager.core.tax_rules import RULES_PATH, RuleTableLoader
+
+REFERENCE = datetime(2025, 4, 10)
+
+
+def test_lru_counts_hits_and_evicts():
+    """Repeated keys hit, and the least recently used entry is evicted"""
+    memo = RuleMemo(maxsize=2, registry=HolidayCalendarRegistry())
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return {"value": value}
+
+    for value in ("a", "b", "a", "c", "b"):
+        key = memo.key("first", value, REFERENCE, None, None, "v1")
+        memo.get(key, lambda value=value: compute(value))
+    assert calls == ["a", "b", "c", "b"]
+    assert memo.stats()["hits"] == 1
+    assert memo.stats()["size"] == 2
+
+
+def test_results_are_copies():
+    """Callers mutating a memoized result do not corrupt the memo"""
+    memo = RuleMemo(registry=HolidayCalendarRegistry())
+    key = memo.key("first", "IES", REFERENCE, None, None, "v1")
+    memo.get(key, lambda: {"rule": "IES deadline"})["rule"] = "changed"
+    assert memo.get(key, lambda: None) == {"rule": "IES deadline"}
+
+
+def test_key_tracks_content_versions_and_calendars():
+    """Equal content shares a key; rule or calendar changes do not"""
+    registry = HolidayCalendarRegistry()
+    memo = RuleMemo(registry=registry)
+    key = memo.key("first", "Entrega da IES", REFERENCE, None, None, "v1")
+    assert key == memo.key("first", "Entrega da IES", REFERENCE, None, None, "v1")
+    assert key != memo.key("first", "Entrega da IES", REFERENCE, None, None, "v2")
+    registry.clear()
+    assert key != memo.key("first", "Entrega da IES", REFERENCE, None, None, "v1")
+
+
+def test_agent_memo_follows_rule_table(tmp_path, monkeypatch):
+    """Editing the rule table changes the memoized agent result"""
+    table = json.loads(RULES_PATH.read_text(encoding="utf-8"))
+    path = tmp_path / "tax_rules.json"
+    path.write_text(json.dumps(table), encoding="utf-8")
+    loader = RuleTableLoader(path, check_interval=0)
+    monkeypatch.setattr(tax_rules, "default_rule_loader", loader)
+    memo = RuleMemo(registry=HolidayCalendarRegistry())
+    monkeypatch.setattr(deadline_agent_backend, "default_rule_memo", memo)
+
+    agent = DeadlineManagerAgent()
+    first = agent.apply_portuguese_tax_rules("Entrega da IES", REFERENCE)
+    again = agent.apply_portuguese_tax_rules("Entrega da IES", REFERENCE)
+    assert first == again
+    assert memo.stats()["hits"] == 1
+
+    table["rules"][1]["day"] = 16
+    path.write_text(json.dumps(table), encoding="utf-8")
+    changed = agent.apply_portuguese_tax_rules("Entrega da IES", REFERENCE)
+    assert changed["deadline"] == datetime(2025, 4, 16)
+    assert memo.stats()["misses"] == 2
+
+
+class FakeGemini:
+    """Stands in for the Gemini client, counting calls"""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        return type("Response", (), {"text": self.answer})()
+
+
+def test_ai_extraction_is_reference_free(monkeypatch):
+    """Re-dating an AI-processed document re-resolves without a new AI call"""
+    monkeypatch.setattr(
+        deadline_agent_backend, "default_spec_memo", RuleMemo(registry=None)
+    )
+    agent = DeadlineManagerAgent()
+    agent.genai_model = FakeGemini(
+        '{"kind": "calendar_days", "days": 20, "rule": "20 days to reply"}'
+    )
+    text = "Pedido de esclarecimentos com resposta em vinte dias"
+
+    first = agent.process_document(text, datetime(2025, 3, 3))
+    second = agent.process_document(text, datetime(2025, 9, 1))
+    assert agent.genai_model.calls == 1
+    assert first["processing_method"] == "ai_inference"
+    assert first["deadline"] == datetime(2025, 3, 23)
+    assert second["deadline"] == datetime(2025, 9, 21)
+    assert second["priority"] == "medium"
+
+
+def test_ai_fixed_dates_and_failures(monkeypatch):
+    """Absolute AI dates become fixed specs; failed answers are retried"""
+    monkeypatch.setattr(
+        deadline_agent_backend, "default_spec_memo", RuleMemo(registry=None)
+    )
+    agent = DeadlineManagerAgent()
+    agent.genai_model = FakeGemini('{"deadline": "2025-11-14"}')
+    assert agent.extract_ai_spec("Texto qualquer")["kind"] == "fixed"
+    result = agent.process_with_gemini_ai("Texto qualquer", datetime(2025, 1, 1))
+    assert result["deadline"] == datetime(2025, 11, 14)
+
+    agent.genai_model = FakeGemini("not json")
+    assert "error" in agent.extract_ai_spec("Outro texto")
+    assert "error" in agent.extract_ai_spec("Outro texto")
+    assert agent.genai_model.calls == 2
+
+
+def test_repeated_process_text_hits_memo(monkeypatch):
+    """Fresh agents dated ``now`` share memo entries for the same day"""
+    memo = RuleMemo(registry=HolidayCalendarRegistry())
+    monkeypatch.setattr(deadline_agent_backend, "default_rule_memo", memo)
+
+    first = deadline_agent_backend.process_text("Entrega da IES")
+    second = deadline_agent_backend.process_text("Entrega da IES")
+    assert first["deadline"] == second["deadline"]
+    stats = memo.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the pipeline counters and latency histograms
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core import deadline_agent_backend
+from ey_deadline_manager.core.deadline_agent_backend import DeadlineManagerAgent
+from ey_deadline_manager.core.metrics import LatencyHistogram, PipelineMetrics
+
+
+def test_histogram_buckets_and_quantiles():
+    """Samples land in their bucket and quantiles report bucket bounds"""
+    histogram = LatencyHistogram()
+    for milliseconds in (0.05, 0.3, 0.4, 3, 20000):
+        histogram.observe(milliseconds)
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 5
+    assert snapshot["buckets"][0.1] == 1
+    assert snapshot["buckets"][0.5] == 2
+    assert snapshot["buckets"][float("inf")] == 1
+    assert snapshot["p50_ms"] == 0.5
+    assert snapshot["p95_ms"] == float("inf")
+
+
+def test_snapshot_is_a_copy():
+    """Snapshots are plain dicts unaffected by later recording"""
+    metrics = PipelineMetrics()
+    metrics.increment("rules", "iva")
+    with metrics.timer("rules"):
+        pass
+    snapshot = metrics.snapshot()
+    metrics.increment("rules", "iva")
+    assert snapshot["rules"] == {"iva": 1}
+    assert snapshot["latency"]["rules"]["count"] == 1
+    metrics.reset()
+    assert metrics.snapshot()["rules"] == {}
+
+
+def test_process_document_records_outcomes(monkeypatch):
+    """Rule hits, outcomes and stage timings are recorded per document"""
+    metrics = PipelineMetrics()
+    monkeypatch.setattr(deadline_agent_backend, "default_metrics", metrics)
+    agent = DeadlineManagerAgent()
+    reference = datetime(2025, 4, 10)
+
+    agent.process_document("Declaração periódica de IVA", reference)
+    agent.process_document("Entregar até 30 de junho de 2025", reference)
+    agent.process_document("Nada a declarar", reference, use_ai_fallback=False)
+    agent.process_document(
+        "Prazo de 10 dias úteis e SAF-T",
+        reference,
+        use_ai_fallback=False,
+        multi_match=True,
+    )
+
+    snapshot = metrics.snapshot()
+    assert snapshot["rules"] == {"iva": 1, "working_days": 1, "saf_t": 1}
+    assert snapshot["outcomes"] == {
+        "rule_based": 2,
+        "date_extraction": 1,
+        "failed": 1,
+    }
+    assert snapshot["latency"]["document"]["count"] == 4
+    assert snapshot["latency"]["rules"]["count"] == 4
+    assert snapshot["latency"]["dates"]["count"] == 2
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the canonical text normalization layer
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.normalize import (
+    NormalizedText,
+    SizedCache,
+    normalize_text,
+)
+from ey_deadline_manager.core.tax_rules import match_all_tax_rules, match_tax_rule
+
+
+def test_canonical_form():
+    """Case, accents, ligatures and whitespace runs are folded"""
+    normalized = normalize_text("  Declaração\n\tMENSAL  de Remunerações ﬁm  ")
+    assert normalized.text == "declaracao mensal de remuneracoes fim"
+
+
+def test_spans_map_back_to_original():
+    """Canonical spans map to the original characters they came from"""
+    original = "Prazo:   10\ndias ÚTEIS"
+    normalized = normalize_text(original)
+    start = normalized.text.index("10 dias uteis")
+    span = normalized.original_span(start, start + len("10 dias uteis"))
+    assert original[slice(*span)] == "10\ndias ÚTEIS"
+
+
+def test_offsets_are_stored_at_edits_only():
+    """Ligatures and decomposed accents map back; plain text needs no offsets"""
+    original = "  ﬁm da Decla\u0301racao\n\n  prazo"
+    normalized = NormalizedText(original)
+    assert normalized.text == "fim da declaracao prazo"
+    for word, expected in [("fim", "ﬁm"), ("declaracao", "Decla\u0301racao")]:
+        start = normalized.text.index(word)
+        span = normalized.original_span(start, start + len(word))
+        assert original[slice(*span)] == expected
+    assert normalized.original_span(len(normalized), len(normalized)) == (
+        len(original),
+        len(original),
+    )
+
+    plain = NormalizedText("prazo de dez dias " * 10_000)
+    assert plain._starts.size == 1
+    assert plain.original_span(180_000 - 6, 180_000 - 1) == (179_994, 179_999)
+
+
+def test_cache_is_bounded_by_size():
+    """Least recently used entries go once the size budget is exceeded"""
+    cache = SizedCache(10, len)
+    assert cache.get("a", lambda: "aaaa") == "aaaa"
+    cache.get("b", lambda: "bbbb")
+    cache.get("a", lambda: "never computed")
+    cache.get("c", lambda: "cccc")
+    assert (len(cache), cache.nbytes) == (2, 8)
+    assert cache.get("a", lambda: "never computed") == "aaaa"
+    # "b" was evicted and is computed again, evicting "c"
+    assert cache.get("b", lambda: "new") == "new"
+    assert cache.get("a", lambda: "never computed") == "aaaa"
+    assert cache.nbytes == 7
+    # Larger than the whole budget: returned but not stored
+    assert cache.get("d", lambda: "d" * 11) == "d" * 11
+    assert len(cache) == 2
+
+
+def test_normalization_is_cached_by_content():
+    """The same content is normalized once and shared"""
+    text = "Declaração periódica de IVA"
+    assert normalize_text(text) is normalize_text("".join(text))
+    assert len(normalize_text(text).digest) == 32
+
+
+def test_rules_match_any_spelling():
+    """One canonical keyword covers accented, unaccented and OCR spellings"""
+    assert match_tax_rule("DECLARAÇÃO MENSAL")["rule"] == "DMR monthly deadline"
+    assert match_tax_rule("prazo de 5 dias uteis")["days"] == 5
+    assert match_tax_rule("prazo de 5\n  dias  Úteis")["days"] == 5
+    [result] = match_all_tax_rules("Retenções  na fonte")
+    assert result["span"] == (0, 19)
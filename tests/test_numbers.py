@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for Portuguese number words in the rule engine
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.numbers import NUMBER_PATTERN, parse_number
+from ey_deadline_manager.core.tax_rules import match_all_tax_rules, match_tax_rule
+
+
+def test_parse_number():
+    """Digits, simple words and "tens e units" compounds are parsed"""
+    assert parse_number("30") == 30
+    assert parse_number("um") == 1
+    assert parse_number("duas") == 2
+    assert parse_number("quinze") == 15
+    assert parse_number("dezanove") == parse_number("dezenove") == 19
+    assert parse_number("vinte e cinco") == 25
+    assert parse_number("noventa e nove") == 99
+    assert parse_number("cem") == 100
+    with pytest.raises(ValueError):
+        parse_number("cinco e vinte")
+
+
+def test_number_pattern_matches_whole_words():
+    """Longer words win and words are not matched inside other words"""
+    number = re.compile(NUMBER_PATTERN)
+    assert number.search("setenta dias").group() == "setenta"
+    assert number.search("dezoito dias").group() == "dezoito"
+    assert number.search("acem dias") is None
+
+
+def test_working_days_in_words():
+    """'quinze dias úteis' resolves like '15 dias úteis'"""
+    spec = match_tax_rule("Dispõe de quinze dias úteis para responder.")
+    assert spec["rule_id"] == "working_days"
+    assert spec["days"] == 15
+    assert match_tax_rule("Dispõe de 15 dias úteis para responder.") == spec
+
+
+def test_compound_working_days():
+    """The whole compound is captured, not just its last word"""
+    text = "No prazo de vinte e cinco dias úteis."
+    spec = match_tax_rule(text)
+    assert spec["kind"] == "working_days"
+    assert spec["days"] == 25
+    (match,) = match_all_tax_rules(text)
+    assert text[slice(*match["span"])] == "vinte e cinco dias úteis"
+
+
+def test_calendar_days_in_words():
+    """'prazo de trinta dias' is a 30 calendar day term"""
+    spec = match_tax_rule("Pode reclamar no prazo de trinta dias.")
+    assert spec["rule_id"] == "calendar_days"
+    assert spec["days"] == 30
+    assert spec["rule"] == "30 days from notification"
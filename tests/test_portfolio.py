@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the portfolio obligation matrix
+"""
+
+import io
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.portfolio import (
+    portfolio_deadline_matrix,
+    upcoming_portfolio_deadlines,
+)
+from ey_deadline_manager.core.schedule import iter_obligation_schedule
+
+CLIENTS = pd.DataFrame(
+    {
+        "client": ["ACE", "ABC Co", "ACCETA SA"],
+        "employer": [True, False, True],
+        "iva_quarterly": [True, True, False],
+        "saf_t": [True, True, True],
+        "subdivision": [None, None, "Madeira"],
+    }
+)
+
+
+def test_matrix_follows_client_flags():
+    """Obligations only apply to flagged clients"""
+    matrix = portfolio_deadline_matrix(
+        CLIENTS, datetime(2025, 1, 1), datetime(2025, 12, 31)
+    )
+    deadline = matrix["deadline"]
+    assert deadline.shape[:2] == (3, len(matrix["obligations"]))
+
+    counts = (~np.isnat(deadline)).sum(axis=2)
+    column = {name: i for i, name in enumerate(matrix["obligations"])}
+    assert counts[:, column["dmr"]].tolist() == [12, 0, 12]
+    assert counts[:, column["iva"]].tolist() == [4, 4, 0]
+    assert counts[:, column["modelo_22"]].tolist() == [0, 0, 0]
+
+
+def test_flags_read_from_csv():
+    """Yes/no flags of an uploaded CSV are parsed, not taken as truthy"""
+    clients = pd.read_csv(
+        io.StringIO(
+            "client,irs,employer,saf_t\n"
+            "ACE,no,no,no\n"
+            "ABC Co,Sim,não,\n"
+            "ACCETA SA,yes,TRUE,1\n"
+        )
+    )
+    matrix = portfolio_deadline_matrix(
+        clients, datetime(2025, 1, 1), datetime(2025, 12, 31)
+    )
+    counts = (~np.isnat(matrix["deadline"])).sum(axis=2)
+    column = {name: i for i, name in enumerate(matrix["obligations"])}
+    assert counts[:, column["modelo_22"]].tolist() == [0, 1, 1]
+    assert counts[:, column["dmr"]].tolist() == [0, 0, 12]
+    assert counts[:, column["saf_t"]].tolist() == [0, 0, 12]
+
+    clients.loc[0, "irs"] = "talvez"
+    with pytest.raises(ValueError, match="talvez"):
+        portfolio_deadline_matrix(clients, datetime(2025, 1, 1), datetime(2025, 12, 31))
+
+
+def test_matrix_matches_schedule():
+    """Each client row equals the scalar schedule for its holiday calendar"""
+    matrix = portfolio_deadline_matrix(
+        CLIENTS, datetime(2025, 1, 1), datetime(2025, 12, 31), ["saf_t"]
+    )
+    for row, subdivision in enumerate(CLIENTS["subdivision"]):
+        expected = [
+            np.datetime64(result["deadline"], "D")
+            for result in iter_obligation_schedule(
+                "saf_t", datetime(2025, 1, 1), datetime(2025, 12, 31), subdivision
+            )
+        ]
+        assert matrix["deadline"][row, 0].tolist() == [
+            day.astype(object) for day in expected
+        ]
+
+
+def test_upcoming_deadlines_for_large_portfolio():
+    """Tens of thousands of clients produce a sorted long table"""
+    n_clients = 20000
+    clients = pd.DataFrame(
+        {
+            "employer": np.arange(n_clients) % 2 == 0,
+            "saf_t": np.ones(n_clients, dtype=bool),
+        }
+    )
+    table = upcoming_portfolio_deadlines(clients, days=90, today=datetime(2025, 3, 1))
+    assert table["deadline"].is_monotonic_increasing
+    # SAF-T for everyone and Modelo 30 + DMR for half of them, 3 months each
+    assert len(table) == n_clients * 3 + n_clients // 2 * 6
+    assert table["deadline"].min() >= pd.Timestamp(2025, 3, 1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the declarative, hot-reloadable tax rule table
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.tax_rules import (
+    RULES_PATH,
+    RuleTableLoader,
+    resolve_tax_rule,
+)
+
+MODELO_10 = {
+    "id": "modelo_10",
+    "triggers": ["modelo 10"],
+    "kind": "annual",
+    "month": 2,
+    "day": 10,
+    "rule": "Modelo 10 - Annual income statement",
+    "priority": "high",
+    "legal_basis": "CIRS - Código do IRS",
+    "confidence": "high",
+    "roll_forward": True,
+}
+
+
+def _write_table(path, extra_rules=()):
+    table = json.loads(RULES_PATH.read_text(encoding="utf-8"))
+    table["rules"] = [*extra_rules, *table["rules"]]
+    path.write_text(json.dumps(table, ensure_ascii=False), encoding="utf-8")
+
+
+def test_added_rule_is_hot_swapped(tmp_path):
+    """A new obligation in the file is picked up without a restart"""
+    path = tmp_path / "tax_rules.json"
+    _write_table(path)
+    loader = RuleTableLoader(path, check_interval=0)
+    in_flight = loader.get()
+    assert in_flight.match("Entrega do Modelo 10") is None
+
+    _write_table(path, [MODELO_10])
+    table = loader.get()
+    assert table is not in_flight
+    assert table.version != in_flight.version
+    assert table.match("Entrega do Modelo 10")["rule"] == MODELO_10["rule"]
+    assert "modelo_10" in table.obligations
+    # Requests holding the previous table keep using it unchanged
+    assert in_flight.match("Entrega do Modelo 10") is None
+
+
+def test_broken_file_keeps_last_good_table(tmp_path):
+    """An invalid table is reported and the previous one keeps serving"""
+    path = tmp_path / "tax_rules.json"
+    _write_table(path)
+    loader = RuleTableLoader(path, check_interval=0)
+    table = loader.get()
+
+    path.write_text('{"rules": [{"id": "x", "kind": "weekly"}]}', encoding="utf-8")
+    assert loader.reload_if_changed() is False
+    assert loader.get() is table
+    assert isinstance(loader.last_error, ValueError)
+
+
+def test_incomplete_rules_are_rejected(tmp_path):
+    """Rules that would fail at resolution never replace the good table"""
+    path = tmp_path / "tax_rules.json"
+    _write_table(path)
+    loader = RuleTableLoader(path, check_interval=0)
+    table = loader.get()
+
+    no_day = {key: value for key, value in MODELO_10.items() if key != "day"}
+    no_priority = {key: value for key, value in MODELO_10.items() if key != "priority"}
+    for broken in (
+        no_day,
+        no_priority,
+        {**MODELO_10, "triggers": "modelo 10"},
+        {**MODELO_10, "triggers": [["modelo 10", 10]]},
+        {**MODELO_10, "month": 2, "day": 30},
+        {**MODELO_10, "kind": "monthly", "day": 31},
+    ):
+        _write_table(path, [broken])
+        assert loader.reload_if_changed() is False
+        assert loader.get() is table
+        assert isinstance(loader.last_error, ValueError | TypeError)
+
+
+def test_day_count_trigger_rules_are_not_obligations(tmp_path):
+    """Only annual, monthly and quarterly rules are recurring obligations"""
+    path = tmp_path / "tax_rules.json"
+    audit = {
+        **MODELO_10,
+        "id": "audicao",
+        "triggers": ["direito de audicao"],
+        "kind": "working_days",
+        "days": 15,
+    }
+    del audit["month"], audit["day"]
+    _write_table(path, [audit])
+    table = RuleTableLoader(path, check_interval=0).get()
+    assert "audicao" not in table.obligations
+    assert "modelo_22" in table.obligations
+
+    spec = table.match("Exerça o direito de audição")
+    assert spec["rule_id"] == "audicao"
+    result = resolve_tax_rule(spec, datetime(2025, 4, 10))
+    assert result["deadline"] == datetime(2025, 5, 6)
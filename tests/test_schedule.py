@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazy recurring-obligation schedule
+"""
+
+import sys
+from datetime import date, datetime
+from itertools import islice
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.schedule import iter_obligation_schedule, iter_schedule
+
+
+def test_monthly_obligation_over_a_year():
+    """SAF-T occurs every month, rolled forward off weekends"""
+    schedule = list(
+        iter_obligation_schedule("saf_t", date(2025, 1, 1), date(2025, 12, 31))
+    )
+    assert len(schedule) == 12
+    may = schedule[4]
+    assert may["original_deadline"] == datetime(2025, 5, 25)
+    assert may["deadline"] == datetime(2025, 5, 26)
+    assert may["obligation"] == "saf_t"
+
+
+def test_quarterly_and_annual_cadence():
+    """IVA yields quarter ends and Modelo 22 one date per year"""
+    iva = list(iter_obligation_schedule("iva", date(2025, 1, 1), date(2026, 12, 31)))
+    assert len(iva) == 8
+    modelo_22 = list(
+        iter_obligation_schedule("modelo_22", date(2025, 1, 1), date(2034, 12, 31))
+    )
+    assert [r["deadline"].year for r in modelo_22] == list(range(2025, 2035))
+
+
+def test_merged_schedule_is_ordered_and_lazy():
+    """The merged stream is sorted and a huge horizon costs nothing up front"""
+    schedule = list(iter_schedule(date(2025, 1, 1), date(2025, 12, 31)))
+    deadlines = [r["deadline"] for r in schedule]
+    assert deadlines == sorted(deadlines)
+    assert len(schedule) == 3 * 12 + 4 + 2
+
+    first = list(islice(iter_schedule(date(2025, 1, 1), date(2999, 12, 31)), 3))
+    assert [r["obligation"] for r in first] == ["dmr", "modelo_30", "saf_t"]
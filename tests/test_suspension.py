@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for judicial-holiday suspension of procedural deadlines
+"""
+
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.deadline_agent_backend import DeadlineManagerAgent
+from ey_deadline_manager.core.holiday_registry import get_judicial_calendar
+from ey_deadline_manager.core.suspension import SuspensionCalendar, judicial_vacations
+
+
+def walk_suspended_days(start_date, num_days, calendar):
+    """Reference implementation: step one day at a time"""
+    current_date = start_date
+    days_added = 0
+    while days_added < num_days:
+        current_date += timedelta(days=1)
+        if current_date.toordinal() in set(calendar.countable_ordinals):
+            days_added += 1
+    return current_date
+
+
+def test_judicial_vacations_intervals():
+    """Summer, Christmas and Easter periods are suspended"""
+    calendar = SuspensionCalendar(2025, 2025, judicial_vacations(2025, 2025))
+    assert calendar.is_suspended(date(2025, 8, 1))
+    assert calendar.is_suspended(date(2025, 1, 2))
+    assert calendar.is_suspended(date(2025, 4, 13))  # Palm Sunday
+    assert calendar.is_suspended(date(2025, 4, 21))  # Easter Monday
+    assert not calendar.is_suspended(date(2025, 4, 22))
+    assert not calendar.is_suspended(date(2025, 7, 15))
+
+
+def test_calendar_days_skip_summer_holidays():
+    """Calendar-day deadlines resume counting on 1 September"""
+    calendar = SuspensionCalendar(2025, 2025, judicial_vacations(2025, 2025))
+    assert calendar.add_days(date(2025, 7, 10), 10) == date(2025, 9, 5)
+
+
+def test_working_days_scalar_and_bulk_agree():
+    """Bulk offsets match the scalar bisect and the day-by-day walk"""
+    calendar = get_judicial_calendar(2024, 2026)
+    starts = [date(2025, 1, 1) + timedelta(days=i * 9) for i in range(40)]
+    offsets = [(i % 3) * 15 for i in range(40)]
+    bulk = calendar.add_days_many(starts, offsets)
+    for start, offset, result in zip(starts, offsets, bulk, strict=True):
+        expected = walk_suspended_days(start, offset, calendar)
+        assert calendar.add_days(start, offset) == expected
+        assert result.astype(date) == expected
+    assert isinstance(bulk, np.ndarray)
+
+
+def test_despacho_deadline_is_suspended():
+    """Despacho de indeferimento deadlines skip the judicial holidays"""
+    agent = DeadlineManagerAgent()
+    text = (
+        "Despacho de indeferimento. Pode apresentar recurso no prazo de 30 dias úteis."
+    )
+    result = agent.apply_portuguese_tax_rules(text, datetime(2025, 7, 1))
+    plain = agent.add_working_days(datetime(2025, 7, 1), 30)
+    assert result["deadline"] > plain
+    assert "suspension" in result
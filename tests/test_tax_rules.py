@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the Portuguese tax rule pipeline
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.deadline_agent_backend import DeadlineManagerAgent
+
+agent = DeadlineManagerAgent()
+
+
+def test_fixed_date_rules_roll_forward():
+    """A SAF-T deadline on a Sunday moves to Monday and keeps the raw date"""
+    result = agent.apply_portuguese_tax_rules("SAF-T Abril", datetime(2025, 4, 10))
+    assert result["deadline"] == datetime(2025, 5, 26)
+    assert result["original_deadline"] == datetime(2025, 5, 25)
+    assert "roll_forward" not in result
+
+
+def test_fixed_date_on_working_day_is_unchanged():
+    """Deadlines already on a working day are left alone"""
+    result = agent.apply_portuguese_tax_rules(
+        "Modelo 30 - retenções na fonte", datetime(2025, 4, 10)
+    )
+    assert result["deadline"] == datetime(2025, 5, 20)
+    assert "original_deadline" not in result
+
+
+SWEEP_TEXTS = [
+    "Declaração Modelo 22 de IRS",
+    "Entrega da IES",
+    "SAF-T mensal",
+    "Declaração periódica de IVA",
+    "Notificação: prazo de 10 dias úteis",
+    "Despacho de indeferimento: prazo de 15 dias úteis",
+    "Recurso: prazo de 30 dias",
+    "Notificação com prazo de 30 dias",
+]
+
+
+def test_sweep_matches_scalar_rules():
+    """Every row of a sweep equals the scalar rule result for that date"""
+    refs = [datetime(2025, 1, 1) + timedelta(days=n) for n in range(0, 365, 7)]
+    for text in SWEEP_TEXTS:
+        table = agent.sweep_reference_dates(text, refs)
+        assert len(table) == len(refs)
+        for ref in refs:
+            expected = agent.apply_portuguese_tax_rules(text, ref)
+            row = table.loc[ref]
+            assert row["deadline"] == expected["deadline"], (text, ref)
+            assert row["original_deadline"] == expected.get(
+                "original_deadline", expected["deadline"]
+            )
+            assert row["rule"] == expected["rule"]
+
+
+def test_sweep_without_rule_is_empty():
+    """Text without a known rule gives an empty table"""
+    table = agent.sweep_reference_dates("Carta sem prazo", [datetime(2025, 1, 1)])
+    assert table.empty
+    assert "deadline" in table.columns
+
+
+MULTI_TEXT = (
+    "Notificação: prazo de 10 dias úteis para resposta. "
+    "Declaração periódica de IVA. "
+    "Recurso: prazo de 30 dias."
+)
+
+
+def test_extract_all_deadlines_in_document_order():
+    """Every obligation in a document is found with its character span"""
+    results = agent.extract_all_deadlines(MULTI_TEXT, datetime(2025, 4, 10))
+    assert [r["rule_id"] for r in results] == [
+        "working_days",
+        "iva",
+        "calendar_days",
+    ]
+    for result in results:
+        start, end = result["span"]
+        assert 0 <= start < end <= len(MULTI_TEXT)
+    assert MULTI_TEXT[slice(*results[0]["span"])].startswith("10 dias")
+    assert "IVA" in MULTI_TEXT[slice(*results[1]["span"])]
+    # Suspension keywords ("recurso") apply to the whole document
+    assert "suspension" in results[0] and "suspension" in results[2]
+    assert results[1]["deadline"] == datetime(2025, 6, 30)
+
+
+def test_process_document_multi_match():
+    """Multi-match processing reports the earliest deadline and all of them"""
+    result = agent.process_document(
+        MULTI_TEXT, datetime(2025, 4, 10), use_ai_fallback=False, multi_match=True
+    )
+    assert len(result["deadlines"]) == 3
+    assert result["deadline"] == min(r["deadline"] for r in result["deadlines"])
+
+
+def test_suspension_keywords_match_whole_words():
+    """'recursos humanos' is not a procedural act; 'despacho de indeferimento' is"""
+    reference = datetime(2025, 1, 1)
+    plain = agent.apply_portuguese_tax_rules(
+        "Recursos humanos: prazo de 10 dias", reference
+    )
+    assert "suspension" not in plain
+    assert plain["deadline"] == datetime(2025, 1, 11)
+
+    procedural = agent.apply_portuguese_tax_rules(
+        "Despacho de indeferimento: prazo de 10 dias", reference
+    )
+    assert "suspension" in procedural
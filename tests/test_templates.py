@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for AT notice template fingerprinting and field extraction
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.deadline_agent_backend import DeadlineManagerAgent
+from ey_deadline_manager.core.templates import (
+    extract_template_deadline,
+    fingerprint_template,
+)
+
+HEADER = """
+Em caso de devolução, remeter a:
+SF-LISBOA 7
+Rua Alfredo Soares, 6
+1400-401 Lisboa
+ ABC, Co.
+DATA DE EMISSÃO:  {issued}
+
+ASSUNTO: {subject} para empresa ABC, Co.
+
+NIF: 50211111 1
+Referência da liquidação: 12345
+Período tributário: Janeiro  - Março  2025
+"""
+
+PAYMENT = HEADER.format(
+    issued="26 de Maio de 2025",
+    subject="Nota de cobrança / Notificação para pagamento voluntário",
+) + (
+    "Total a pagar: € 210000\n"
+    "O pagamento voluntário poderá ser efetuado até 2 meses após a data de "
+    "emissão deste documento."
+)
+
+DIVERGENCE = HEADER.format(
+    issued="27-05-2025", subject="Notificação por divergência de IVA"
+) + (
+    "Solicita -se, assim, que no prazo de 10 dias úteis  a contar da data de "
+    "receção da presente notificação, se pronuncie."
+)
+
+DISMISSAL = HEADER.format(
+    issued="29-04-2025",
+    subject="Despacho de indeferimento de reclamação ou impugnação",
+) + (
+    "Poderá ser interposta impugnação judicial no prazo de 90 dias  contados "
+    "da data da notificação deste despacho."
+)
+
+MISSING = HEADER.format(
+    issued="02-06-2025", subject="Aviso de obrigação declarativa em falta"
+) + (
+    "cuja data limite de entrega foi 20 de maio de 2025. Solicita-se que "
+    "proceda à submissão da referida declaração até dia\n20 de junho de 2025."
+)
+
+
+def test_fingerprints():
+    """Each template is recognised from its header; other text is not"""
+    assert fingerprint_template(PAYMENT) == "nota_cobranca"
+    assert fingerprint_template(DIVERGENCE) == "divergencia_iva"
+    assert fingerprint_template(DISMISSAL) == "despacho_indeferimento"
+    assert fingerprint_template(MISSING) == "obrigacao_em_falta"
+    assert fingerprint_template("Declaração periódica de IVA") is None
+
+
+def test_template_deadlines():
+    """Dedicated extractors compute each template's deadline"""
+    payment = extract_template_deadline(PAYMENT, datetime(2025, 5, 26))
+    assert payment["deadline"] == datetime(2025, 7, 28)
+    assert payment["original_deadline"] == datetime(2025, 7, 26)
+    assert payment["fields"] == {
+        "nif": "50211111 1",
+        "liquidation_reference": "12345",
+        "tax_period": "Janeiro - Março 2025",
+        "total_due": "210000",
+    }
+
+    divergence = extract_template_deadline(DIVERGENCE, datetime(2025, 5, 27))
+    assert divergence["deadline"] == datetime(2025, 6, 11)
+
+    # 90 days with the judicial holidays suspended end on a Saturday
+    dismissal = extract_template_deadline(DISMISSAL, datetime(2025, 4, 29))
+    assert dismissal["deadline"] == datetime(2025, 9, 15)
+    assert "suspension" in dismissal
+
+    missing = extract_template_deadline(MISSING, datetime(2025, 6, 2))
+    assert missing["deadline"] == datetime(2025, 6, 20)
+
+
+def test_templates_bypass_the_generic_chain():
+    """Known templates are answered before the rules, using the issue date"""
+    result = DeadlineManagerAgent().process_document(DIVERGENCE)
+    assert result["processing_method"] == "template"
+    assert result["template"] == "divergencia_iva"
+    assert result["reference_date"] == datetime(2025, 5, 27)
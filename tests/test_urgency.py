@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Tests for working-day based urgency classification
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.urgency import classify_urgency, classify_urgency_many
+
+
+def test_classify_urgency_uses_working_days():
+    """Holidays and weekends do not count towards the remaining days"""
+    today = date(2025, 6, 6)  # Friday before the 10 June holiday
+    days_left, label = classify_urgency(date(2025, 6, 13), today)
+    assert days_left == 4
+    assert label == "URGENT"
+
+
+def test_classify_urgency_many_labels():
+    """Thousands of deadlines are classified in one call"""
+    today = date(2025, 1, 6)
+    deadlines = np.datetime64("2025-01-06") + np.arange(5000) % 120
+    days_left, labels = classify_urgency_many(deadlines, today)
+    assert days_left.shape == labels.shape == (5000,)
+    assert set(labels.tolist()) == {"URGENT", "IMPORTANT", "NORMAL"}
+    assert (labels[days_left <= 5] == "URGENT").all()
+    assert (labels[days_left > 22] == "NORMAL").all()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for trigger-windowed scanning of large documents
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core import deadline_agent_backend
+from ey_deadline_manager.core.deadline_agent_backend import DeadlineManagerAgent
+from ey_deadline_manager.core.memo import RuleMemo
+from ey_deadline_manager.core.windows import (
+    MAX_WINDOW_SHARE,
+    WINDOW_THRESHOLD,
+    document_excerpt,
+    sentence_spans,
+    trigger_windows,
+)
+
+REFERENCE = datetime(2025, 4, 10)
+
+FILLER = (
+    "O sujeito passivo apresentou os documentos contabilísticos solicitados. "
+    "Foram analisadas as faturas emitidas no exercício, "
+    "no montante de 15.300,00 euros.\n"
+)
+PAGE = FILLER * 12
+DEADLINE = (
+    "Fica notificado para, no prazo de quinze dias úteis, exercer o direito de audição."
+)
+REPORT = PAGE + DEADLINE + "\n" + PAGE * 100
+
+# Ordinary inspection-report wording: "iva", "dia" and "ies" inside longer
+# words, and a whole-word "IVA" and "até" on every page
+PROSE_PAGE = (
+    "Relativamente ao exercício de 2023, a equipa analisou a contabilidade. "
+    "A margem média das vendas manteve-se estável ao longo do ano. "
+    "A liquidação definitiva do imposto não apresentou desvios materiais. "
+    "Foram verificadas as séries de faturação e o imediato registo das vendas. "
+    "O sujeito passivo apresentou os documentos contabilísticos solicitados. "
+    "As amortizações do período foram calculadas com as taxas legais. "
+    "Os inventários foram valorizados ao custo médio ponderado. "
+    "Não foram detetadas divergências nos mapas de depreciações. "
+    "As contas de terceiros encontram-se devidamente reconciliadas. "
+    "Os gastos com pessoal estão suportados pelos respetivos recibos. "
+    "As provisões constituídas encontram-se documentadas. "
+    "Os rendimentos financeiros foram corretamente especializados. "
+    "O IVA liquidado nas faturas foi confrontado com as declarações periódicas. "
+    "As operações com partes relacionadas foram analisadas em detalhe. "
+    "Os contratos de locação foram revistos pela equipa de inspeção. "
+    "O ativo fixo tangível foi inventariado fisicamente. "
+    "Os documentos foram disponibilizados até à conclusão dos trabalhos. "
+    "As retenções sobre rendimentos de capitais estão corretas. "
+    "A documentação relativa aos subsídios recebidos foi analisada. "
+    "Não se identificaram outras situações relevantes.\n"
+)
+
+
+def test_sentence_spans():
+    """Sentences end at punctuation followed by a space"""
+    text = "primeira frase. segunda; terceira 15.300,00 euros"
+    assert [text[s:e] for s, e in sentence_spans(text)] == [
+        "primeira frase.",
+        "segunda;",
+        "terceira 15.300,00 euros",
+    ]
+
+
+def test_windows_cover_triggers_with_context():
+    """A trigger's window spans its sentence and one sentence each side"""
+    text = "um. dois. o prazo termina. tres. quatro."
+    ((start, end),) = trigger_windows(text)
+    assert text[start:end] == "dois. o prazo termina. tres."
+
+
+def test_short_documents_are_kept_whole():
+    """Below the threshold the excerpt is the document itself"""
+    excerpt = document_excerpt(DEADLINE)
+    assert excerpt.text is DEADLINE
+    assert not excerpt.windowed
+
+
+def test_large_document_excerpt():
+    """A long report is cut down to the sentences around its deadline"""
+    assert len(REPORT) > WINDOW_THRESHOLD
+    excerpt = document_excerpt(REPORT)
+    assert excerpt.windowed
+    assert DEADLINE in excerpt.text
+    assert len(excerpt) < 1000
+    start = excerpt.text.index("quinze")
+    original = excerpt.original_span(start, start + len("quinze"))
+    assert REPORT[slice(*original)] == "quinze"
+
+
+def test_report_wording_is_cut_down():
+    """Keywords inside longer words do not open windows"""
+    report = PROSE_PAGE * 5 + DEADLINE + "\n" + PROSE_PAGE * 100
+    excerpt = document_excerpt(report)
+    assert excerpt.windowed
+    assert DEADLINE in excerpt.text
+    assert len(excerpt) < len(report) * MAX_WINDOW_SHARE
+    assert "séries" not in excerpt.text
+
+
+def test_mostly_relevant_documents_are_kept_whole():
+    """Windows covering most of a document fall back to the document"""
+    report = (DEADLINE + " " + FILLER) * 200
+    assert len(report) > WINDOW_THRESHOLD
+    excerpt = document_excerpt(report)
+    assert excerpt.text is report
+    assert not excerpt.windowed
+
+
+def test_large_document_pipeline():
+    """Rules run on the windows and spans still point into the document"""
+    agent = DeadlineManagerAgent()
+    result = agent.process_document(
+        REPORT, REFERENCE, use_ai_fallback=False, multi_match=True
+    )
+    assert result["processing_method"] == "rule_based"
+    assert result["rule"] == "15 working days from notification"
+    (deadline,) = result["deadlines"]
+    assert REPORT[slice(*deadline["span"])] == "quinze dias úteis"
+
+
+def test_only_windows_reach_the_ai(monkeypatch):
+    """The AI prompt is built from the trigger windows, not the whole report"""
+    monkeypatch.setattr(
+        deadline_agent_backend, "default_spec_memo", RuleMemo(registry=None)
+    )
+    agent = DeadlineManagerAgent()
+    seen = []
+
+    def query(text):
+        seen.append(text)
+        return {"error": "No deadline found"}
+
+    monkeypatch.setattr(agent, "_query_ai_for_spec", query)
+    reply = "Deve regularizar a situação até ao fim do mês seguinte.\n"
+    report = PAGE + reply + PAGE * 100
+    agent.process_document(report, REFERENCE)
+    (prompt_text,) = seen
+    assert "até ao fim do mês seguinte" in prompt_text
+    assert len(prompt_text) < 1000
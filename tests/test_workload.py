@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the bincount deadline workload aggregation
+"""
+
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ey_deadline_manager.core.workload import workload_counts, workload_heatmap
+
+DEADLINES = [
+    datetime(2025, 5, 20),
+    datetime(2025, 5, 20),
+    datetime(2025, 5, 26),
+    datetime(2025, 6, 10),
+    None,
+]
+OBLIGATIONS = ["modelo_30", "modelo_30", "saf_t", "dmr", "dmr"]
+
+
+def test_counts_match_pandas_groupby():
+    """Daily, weekly and per-obligation counts agree with a groupby"""
+    counts = workload_counts(
+        DEADLINES, date(2025, 5, 1), date(2025, 6, 30), OBLIGATIONS
+    )
+    frame = pd.DataFrame({"deadline": DEADLINES, "obligation": OBLIGATIONS}).dropna()
+
+    by_day = frame.groupby("deadline").size()
+    nonzero = counts["per_day"] > 0
+    assert counts["days"][nonzero].tolist() == [d.date() for d in by_day.index]
+    assert counts["per_day"][nonzero].tolist() == by_day.tolist()
+
+    assert counts["weeks"][0] == np.datetime64("2025-04-28")
+    assert counts["per_week"].sum() == len(frame)
+    assert dict(
+        zip(counts["obligation_labels"], counts["per_obligation"].tolist(), strict=True)
+    ) == {"modelo_30": 2, "saf_t": 1, "dmr": 1}
+    assert counts["per_obligation_day"].sum(axis=1).tolist() == [2, 1, 1]
+
+
+def test_unlabelled_deadlines():
+    """Deadlines without an obligation count per day but under no obligation"""
+    counts = workload_counts(
+        DEADLINES,
+        date(2025, 5, 1),
+        date(2025, 6, 30),
+        ["iva", None, np.nan, "dmr", None],
+    )
+    assert counts["per_day"].sum() == 4
+    assert counts["obligation_labels"] == ["iva", "dmr"]
+    assert counts["per_obligation"].tolist() == [1, 1]
+    assert counts["per_obligation_day"].sum() == 2
+
+
+def test_out_of_range_deadlines_are_ignored():
+    """Only deadlines inside the window are counted"""
+    counts = workload_counts(DEADLINES, date(2025, 5, 21), date(2025, 5, 31))
+    assert counts["per_day"].sum() == 1
+    assert counts["days"].size == 11
+
+
+def test_heatmap_grid_positions():
+    """Each deadline lands on its weekday row and week column"""
+    grid, weeks = workload_heatmap(DEADLINES, date(2025, 5, 1), date(2025, 6, 30))
+    assert grid.shape == (7, weeks.size)
+    assert grid.sum() == 4
+    # Tuesday 2025-05-20 is in the fourth week starting 2025-04-28
+    assert grid[1, 3] == 2
+    assert grid[0, 4] == 1